@@ -0,0 +1,54 @@
+"""
+type.py の import が軽いままであることを確かめるテスト
+
+実行例:
+    python -m unittest discover -s src/day-00002_2025-02-26
+"""
+
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+
+
+def _import_type():
+    """別のプロセスで python -X importtime -c "import type" を実行し、結果を返す"""
+    return subprocess.run([sys.executable, "-X", "importtime", "-c", "import type"],
+                          cwd=HERE, capture_output=True, text=True)
+
+
+def _imported_modules(stderr):
+    """importtime の表（標準エラー出力）から、import されたモジュール名の一覧を取り出す"""
+    names = []
+    for line in stderr.splitlines():
+        # 形式: "import time:   self [us] | cumulative | imported package"
+        if line.startswith("import time:") and "|" in line:
+            names.append(line.rsplit("|", 1)[1].strip())
+    return names
+
+
+class ImportTypeTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.result = _import_type()
+        cls.modules = _imported_modules(cls.result.stderr)
+
+    def test_import_succeeds(self):
+        self.assertEqual(self.result.returncode, 0, self.result.stderr)
+        # このディレクトリの type.py が import されたこと
+        self.assertIn("type", self.modules)
+
+    def test_heavy_dependencies_are_not_imported(self):
+        for package in ("numpy", "icecream"):
+            with self.subTest(package=package):
+                loaded = [name for name in self.modules if name.split(".")[0] == package]
+                self.assertEqual(loaded, [], f"import type で {package} が読み込まれています")
+
+    def test_import_prints_nothing(self):
+        self.assertEqual(self.result.stdout, "")
+
+
+if __name__ == "__main__":
+    unittest.main()
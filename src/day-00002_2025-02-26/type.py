@@ -1,238 +1,68 @@
 """
 Pythonの主要な型とその使用例を示すサンプルコード
+
+各型の例は demo_* 関数にまとめ、main() でまとめて実行します。
+icecream と numpy は読み込みに時間がかかるため、使う関数の中で読み込みます
+（greet などの関数を使うために import しただけでは読み込まれません）。
+
+実行例:
+    python type.py               # すべての例を実行する
+    python type.py --importtime  # import にかかる時間を -X importtime で計測する
 """
-from icecream import ic 
-# 基本的な型 -----------------------------------------
-print("基本的な型")
-# int型: 整数値を表現。計算、カウント、インデックス参照などに使用
-print("int型: 整数値を表現。計算、カウント、インデックス参照などに使用")
-integer_value = 42
-ic(integer_value)
-ic(integer_value + 10)# 算術演算
-ic(integer_value // 10) # 整数除算
-
-# float型: 小数点を含む数値。科学計算や割合の表現などに使用
-print("float型: 小数点を含む数値。科学計算や割合の表現などに使用")
-float_value = 3.14
-print(float_value)
-ic(float_value * (5 ** 2))  # 円の面積計算
-
-# bool型: 真偽値。条件分岐やフラグとして使用
-print("# bool型: 真偽値。条件分岐やフラグとして使用")
-boolean_value = True
-if boolean_value:
-    print("条件は真です")
-is_active = False  # ユーザーの状態を表すフラグ
-
-# complex型: 複素数。科学計算や信号処理などに使用
-print("complex型: 複素数。科学計算や信号処理などに使用")
-complex_value = 1 + 2j
-ic(complex_value)
-magnitude = abs(complex_value)  # 複素数の大きさ
-ic(magnitude)
-conjugate = complex_value.conjugate()  # 共役複素数
-ic(conjugate)
-
-# str型: 文字列。テキストデータの表現やメッセージ表示などに使用
-print("str型: 文字列。テキストデータの表現やメッセージ表示などに使用")
-string_value = "Hello, World!"
-ic(string_value)
-greeting = "こんにちは、" + "世界！"  # 文字列連結
-ic(greeting)
-multiline = """複数行の
-テキストも
-表現できます"""  # 複数行の文字列
-ic(multiline)
-
-# シーケンス型 -----------------------------------------
-print("シーケンス型")
-# list型: 順序付き可変コレクション。データの集合や順序が重要な場合に使用
-print("list型: 順序付き可変コレクション。データの集合や順序が重要な場合に使用")
-list_value = [1, 2, 3, 4, 5]
-ic(list_value)
-list_value.append(6)  # 要素の追加
-ic(list_value)
-first_three = list_value[:3]  # スライス処理
-ic(first_three)
-
-# tuple型: 順序付き不変コレクション。変更されない値のグループや多値返却に使用
-print("tuple型: 順序付き不変コレクション。変更されない値のグループや多値返却に使用")
-tuple_value = (1, 2, 3, 4, 5)
-ic(tuple_value)
-x, y, z = (10, 20, 30)  # アンパック
-ic(x,y,z)
-point = (3.5, 4.2)  # 座標点など、関連する値のグループ化
-ic(point)
-
-# range型: 数値シーケンス。ループの反復回数指定やインデックス生成に使用
-print("range型: 数値シーケンス。ループの反復回数指定やインデックス生成に使用")
-range_value = range(10)  # 0から9までの数値シーケンス
-ic(range_value)
-for i in range(5):
-    ic(i)  # 0から4まで順に表示（ループ制御）
-even_numbers = range(0, 10, 2)  # 0, 2, 4, 6, 8（偶数のみ）
-ic(even_numbers)
-
-# マッピング型 -----------------------------------------
-print("マッピング型")
-# dict型: キーと値のペアを格納。関連データの検索や構造化に使用
-print("dict型: キーと値のペアを格納。関連データの検索や構造化に使用")
-dict_value = {"name": "Alice", "age": 30, "email": "alice@example.com"}
-ic(dict_value)
-user_age = dict_value["age"]  # キーによる値の取得
-ic(user_age)
-dict_value["location"] = "Tokyo"  # 新しいキー・値の追加
-ic(dict_value)
-employee_data = {
-    "id": "E12345",
-    "department": "Engineering",
-    "manager": "Bob Smith"
-}  # 構造化データの表現
-ic(employee_data)
-
-# セット型 -----------------------------------------
-print("セット型")
-# set型: 重複のない可変コレクション。一意の値の集合や集合演算に使用
-print("set型: 重複のない可変コレクション。一意の値の集合や集合演算に使用")
-set_value = {1, 2, 3, 4, 5}
-ic(set_value)
-set_value.add(6)  # 要素の追加
-ic(set_value)
-unique_chars = set("mississippi")  # 'm', 'i', 's', 'p'（重複除去）
-ic(unique_chars)
-is_member = 3 in set_value  # 所属判定（高速）
-ic(is_member)
-tags = {"python", "programming", "tutorial"}  # タグのような一意の識別子
-ic(tags)
-ic(type(tags))
-
-# frozenset型: 重複のない不変コレクション。辞書のキーやセットの要素として使用可能
-print("frozenset型: 重複のない不変コレクション。辞書のキーやセットの要素として使用可能")
-frozenset_value = frozenset([1, 2, 3])
-ic(frozenset_value)
-# ハッシュ可能なため、辞書のキーに使用可能
-cache = {frozenset([1, 2]): "data for [1, 2]"}
-ic(cache)
-
-# 商品IDの組み合わせごとの割引率
-discount_rates = {
-    frozenset([101, 102]): 10,  # 商品101と102を一緒に買うと10%オフ
-    frozenset([101, 103, 105]): 15,  # 商品101、103、105を一緒に買うと15%オフ
+import collections
+import functools
+import importlib
+import itertools
+import sys
+from array import array
+from pathlib import Path
+from typing import List, Dict, Set, Tuple, Union, Optional, Any, Callable
+
+# 属性として参照されたときに初めて読み込むもの（名前: (モジュール名, モジュール内の属性名)）
+_LAZY_ATTRIBUTES = {
+    "np": ("numpy", None),
+    "ic": ("icecream", "ic"),
 }
-ic(discount_rates)
-
-# カートの中の商品
-cart = [105, 101, 103]
-ic(cart)
-# 割引を計算
-cart_set = frozenset(cart)
-ic(cart_set)
-if cart_set in discount_rates:
-    discount = discount_rates[cart_set]
-    print(f"適用される割引率: {discount}%")  # "適用される割引率: 15%" が表示される
-
-# 不変なので、一度生成後は変更不可
-# frozenset_value.add(4)  # これはエラーになる
-
-# バイナリシーケンス型 -----------------------------------------
-print("バイナリシーケンス型")
-# bytes型: 不変バイト列。バイナリデータや文字エンコーディングに使用
-print("bytes型: 不変バイト列。バイナリデータや文字エンコーディングに使用")
-bytes_value = b"hello"
-ic(bytes_value)
-file_signature = bytes([0x89, 0x50, 0x4E, 0x47])  # PNGファイルの先頭バイト
-ic(file_signature)
-encoded = "こんにちは".encode('utf-8')  # 文字列をバイトにエンコード
-ic(encoded)
-
-# bytearray型: 可変バイト列。バイナリデータの編集に使用
-print("bytearray型: 可変バイト列。バイナリデータの編集に使用")
-bytearray_value = bytearray(b"hello")
-ic(bytearray_value)
-bytearray_value[0] = 72  # 'h'を'H'に変更
-ic(bytearray_value)
-buffer = bytearray(1024)  # 1KBのバッファ初期化
-ic(buffer)
-
-# memoryview型: メモリ内のバイトデータの効率的なアクセスに使用
-print("memoryview型: メモリ内のバイトデータの効率的なアクセスに使用、大規模なバイナリデータに有用")
-memoryview_value = memoryview(bytes_value)
-ic(memoryview_value)
-first_byte = memoryview_value[0]  # コピーなしでデータにアクセス
-ic(first_byte)
-slice_view = memoryview_value[1:3]  # コピーなしでスライス処理
-ic(slice_view)
-
-# その他の型 -----------------------------------------
-print("その他の型")
-# None型: 値の不在を表す。初期化や関数の戻り値などに使用
-print("None型: 値の不在を表す。初期化や関数の戻り値などに使用")
-none_value = None
-ic(none_value)
+
+
+def __getattr__(name):
+    """
+    重い依存モジュールを、type.np や type.ic のように参照されたときに読み込む
+
+    Args:
+        name: 属性名
+
+    Returns:
+        読み込んだモジュールまたはその属性
+    """
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _LAZY_ATTRIBUTES[name]
+    value = importlib.import_module(module_name)
+    if attribute is not None:
+        value = getattr(value, attribute)
+    # 次からは通常の属性として参照できるようにする
+    globals()[name] = value
+    return value
+
+
+# 例で使う関数・クラス -----------------------------------------
 def optional_operation(value=None):
     if value is None:
         return "デフォルト処理"
     return f"値 {value} での処理"
-ic(optional_operation())
-
-# type型: オブジェクトの型を表す。型チェックや動的オブジェクト生成に使用
-print("type型: オブジェクトの型を表す。型チェックや動的オブジェクト生成に使用")
-type_value = type(42)  # <class 'int'>
-ic(type_value)
-if type("hello") is str:
-    print("これは文字列です")
-
-# object型: 全てのクラスの基底。汎用オブジェクトやプレースホルダとして使用
-print("object型: 全てのクラスの基底。汎用オブジェクトやプレースホルダとして使用")
-object_value = object()
-ic(object_value)
+
+
 # カスタムクラスの基底クラスとして使用
 class CustomObject(object):
     pass
+
+
 # 上記と同義
 class CustomObject2:
     pass
 
-# Ellipsis型: 省略記号。多次元配列のスライスや未実装部分の表現に使用
-print("Ellipsis型: 省略記号。多次元配列のスライスや未実装部分の表現に使用")
-ellipsis_value = ...
-ic(ellipsis_value)
-# NumPyなどでの次元指定
-# array[..., 0] は全ての次元の最初の要素
-import numpy as np
-array = np.zeros((5, 5, 5))  # 3次元配列
-ic(array)
-# 最初の次元はすべて、最後の次元は0番目の要素を取得
-subset = array[..., 0]
-ic(subset)
-# これは以下と同等:
-subset2 = array[:, :, 0]
-ic(subset2)
-
-# 具体例
-array = np.zeros((2, 3, 4))  # 2x3x4の3次元配列
-
-# 各要素を一意に特定できる値で埋める
-# 100*i + 10*j + k の形式で値を設定（i,j,kはそれぞれの次元のインデックス）
-for i in range(2):
-    for j in range(3):
-        for k in range(4):
-            array[i, j, k] = 100*i + 10*j + k
-
-# 配列全体を表示
-print("===== 元の3次元配列 =====")
-ic(array)
-ic("\n形状:", array.shape)  # (2, 3, 4)
-
-print("\n===== array[..., 0] の結果 =====")
-subset = array[..., 0]
-ic(subset)
-ic("\n形状:", subset.shape)  # (2, 3)
-
-# NotImplemented型: 特殊メソッドが特定の入力に対応していないことを示す
-print("NotImplemented型: 特殊メソッドが特定の入力に対応していないことを示す")
-notimplemented_value = NotImplemented
-ic(notimplemented_value)
+
 class CustomNumber:
     def __add__(self, other):
         if isinstance(other, CustomNumber):
@@ -246,94 +76,852 @@ class CustomNumber:
 #return NotImplemented - 異なる型との加算は実装していないことを Python に伝えます。
 #NotImplemented を返すと、Python はもう一方のオブジェクトの反対向きのメソッド（この場合は other.__radd__(self)）を試すようになります。それも実装されていなければ、TypeError が発生します。
 
-a = CustomNumber()
-b = CustomNumber()
-c = a + b  # 動作する（CustomNumber インスタンスを返す）
-# d = a + 5  # NotImplemented が返されるので、int.__radd__(a) が試されるがこれも実装されていないため、TypeError が発生
-
-# コレクション関連（importが必要）-----------------------------------------
-print("コレクション関連（importが必要）")
-import collections
-
-# namedtuple: フィールド名を持つタプル。小さなデータ構造やレコードに使用
-Person = collections.namedtuple('Person', ['name', 'age'])
-person = Person("Bob", 25)
-print(person.name)  # 名前付きフィールドでアクセス
-# データベースの行やCSVレコードの表現に最適
-
-# deque: 両端キュー。両端からの高速な挿入・削除が必要な場合に使用
-deque_value = collections.deque([1, 2, 3])
-deque_value.appendleft(0)  # 左端に追加
-deque_value.pop()  # 右端から削除
-# キュー、スタック、または固定サイズバッファとして使用
-
-# ChainMap: 複数の辞書を結合。設定の階層や検索順序が必要な場合
-chainmap_value = collections.ChainMap({'a': 1}, {'b': 2}, {'a': 3})
-# 最初のマップで見つかった値が使用される: chainmap_value['a'] は 1
-# 設定の階層（デフォルト→ユーザー設定→一時的な設定）などに使用
-
-# Counter: 要素のカウント。頻度分析や集計に使用
-counter_value = collections.Counter(['a', 'b', 'a', 'c', 'a'])
-most_common = counter_value.most_common(2)  # [('a', 3), ('b', 1)]
-# テキスト分析、投票集計、インベントリ管理などに有用
-
-# OrderedDict: 挿入順序を保持する辞書。順序が重要な場合に使用
-ordered_dict = collections.OrderedDict([('a', 1), ('b', 2)])
-ordered_dict['c'] = 3  # 挿入順で保持
-# Python 3.7以降では通常のdictも順序を保持するが、明示的な意図の表現に使用
-
-# defaultdict: キーが存在しない場合にデフォルト値を提供する辞書
-default_dict = collections.defaultdict(int)  # 存在しないキーに対して0を返す
-default_dict['a'] += 1  # 'a'が存在しなくても、エラーにならず1になる
-# グループ化や頻度カウントなどに便利
-word_counts = collections.defaultdict(int)
-for word in ["apple", "banana", "apple", "orange"]:
-    word_counts[word] += 1
-
-# 型ヒント関連（Python 3.5以降）-----------------------------------------
-print("型ヒント関連")
-from typing import List, Dict, Set, Tuple, Union, Optional, Any, Callable
 
 # 基本的な型ヒント: コードの意図を明確にし、静的型チェックを可能にする
 def greet(name: str) -> str:
     """名前を受け取り、挨拶を返す関数"""
     return f"Hello, {name}!"
 
-# List: 特定の型のリスト。要素の型を統一したいコレクションに使用
-numbers: List[int] = [1, 2, 3]
-# 数値のみのリストであることを明示
-
-# Dict: キーと値の型を指定した辞書。構造化データの型定義に使用
-name_ages: Dict[str, int] = {"Alice": 30, "Bob": 25}
-# 文字列をキー、整数を値とする辞書であることを明示
-
-# Set: 特定の型の集合。一意の値のコレクションの型定義に使用
-unique_numbers: Set[int] = {1, 2, 3}
-# 整数のセットであることを明示
-
-# Tuple: 複数の型からなるタプル。固定長の異なる型の集合に使用
-coordinates: Tuple[float, float] = (10.5, 20.3)
-# 2つの浮動小数点数からなる座標のような構造
 
-# Union: 複数の型のいずれか。多様な型を受け入れる場合に使用
-result: Union[int, str] = "success"
-# 整数か文字列のいずれかであることを示す
 def process_input(value: Union[int, str, float]) -> str:
     return str(value)
 
-# Optional: 特定の型またはNone。値が存在しない可能性がある場合に使用
-maybe_name: Optional[str] = None  # str | None と同等
-# 文字列またはNoneであることを示す
+
 def find_user(id: int) -> Optional[Dict[str, Any]]:
     # ユーザーが見つからない場合はNoneを返す可能性がある
     pass
 
-# Any: 任意の型。型制約がない場合に使用（なるべく避けるべき）
-anything: Any = 42  # どんな型でも許容
-# 型チェックを一部分だけ無効にしたい場合や、動的な型の場合に使用
 
-# Callable: 呼び出し可能なオブジェクト。関数やメソッドの型定義に使用
-callback: Callable[[int, int], int] = lambda x, y: x + y
-# 2つのintを引数に取り、intを返す関数であることを示す
 def apply_operation(x: int, y: int, operation: Callable[[int, int], int]) -> int:
-    return operation(x, y)
\ No newline at end of file
+    return operation(x, y)
+
+
+# 商品の組み合わせ（バンドル）ごとの割引の検索 -----------------------------------------
+class BundleIndex:
+    """
+    バンドル（商品IDの frozenset）と割引率の表から、カートに含まれるバンドルを探すクラス
+
+    discount_rates[frozenset(cart)] はカートとバンドルが完全に一致しないと見つからないが、
+    実際のカートはバンドルより多くの商品を含む。商品IDごとに、その商品を含むバンドルの
+    一覧（転置リスト）を持ち、カートの商品の一覧だけをたどって各バンドルに含まれる商品の数を数える。
+    数がバンドルの大きさに達したものがカートに含まれるバンドルなので、
+    調べる量はバンドルの総数ではなく、カートの商品を含むバンドルの数に比例する。
+    同じカートに対する結果はキャッシュする。
+    """
+
+    def __init__(self, bundles: Any = (), cache_size: int = 4096):
+        """
+        Args:
+            bundles: {バンドル: 割引率} の辞書、または (バンドル, 割引率) のイテラブル
+            cache_size: 結果をキャッシュするカートの数
+        """
+        self._bundles: List[frozenset] = []
+        self._rates: List[Any] = []
+        self._sizes: List[int] = []
+        # 商品ID -> その商品を含むバンドルの番号のリスト
+        self._postings: Dict[Any, List[int]] = collections.defaultdict(list)
+        # 空のバンドルはどのカートにも含まれる
+        self._empty: List[int] = []
+        self._lookup = functools.lru_cache(maxsize=cache_size)(self._find)
+        items = bundles.items() if isinstance(bundles, dict) else bundles
+        for bundle, rate in items:
+            self.add(bundle, rate)
+
+    def __len__(self) -> int:
+        return len(self._bundles)
+
+    def add(self, bundle: Any, rate: Any) -> None:
+        """
+        バンドルを追加する（キャッシュは消える）
+
+        Args:
+            bundle: 商品IDのイテラブル
+            rate: 割引率
+        """
+        bundle = frozenset(bundle)
+        index = len(self._bundles)
+        self._bundles.append(bundle)
+        self._rates.append(rate)
+        self._sizes.append(len(bundle))
+        if not bundle:
+            self._empty.append(index)
+        for item in bundle:
+            self._postings[item].append(index)
+        self._lookup.cache_clear()
+
+    def _find(self, cart: frozenset) -> Tuple[int, ...]:
+        """カートに含まれるバンドルの番号を返す（キャッシュされる本体）"""
+        # カートの各商品の転置リストをつなげて、バンドルごとに出てきた回数を数える
+        postings = self._postings
+        hits = collections.Counter(itertools.chain.from_iterable(postings[item] for item in cart if item in postings))
+        sizes = self._sizes
+        return tuple(self._empty) + tuple(index for index, count in hits.items() if count == sizes[index])
+
+    def matching(self, cart: Any) -> Dict[frozenset, Any]:
+        """
+        カートに含まれるすべてのバンドルを返す
+
+        Args:
+            cart: カートの商品IDのイテラブル（重複してもよい）
+
+        Returns:
+            dict: カートに含まれるバンドルをキー、割引率を値とする辞書
+        """
+        return {self._bundles[index]: self._rates[index] for index in self._lookup(frozenset(cart))}
+
+    def best(self, cart: Any) -> Optional[Tuple[frozenset, Any]]:
+        """
+        カートに含まれるバンドルのうち、割引率が最も大きいものを返す
+
+        Args:
+            cart: カートの商品IDのイテラブル（重複してもよい）
+
+        Returns:
+            tuple: (バンドル, 割引率)。カートに含まれるバンドルがなければ None
+        """
+        indices = self._lookup(frozenset(cart))
+        if not indices:
+            return None
+        index = max(indices, key=self._rates.__getitem__)
+        return self._bundles[index], self._rates[index]
+
+
+# 列ごとに持つレコードの表（namedtuple や dict を大量に持つ代わり） -----------------------------------------
+# CSV から一度にまとめて列に追加する行数
+_CSV_CHUNK_ROWS = 1 << 16
+
+
+class _StringDictionary:
+    """文字列の辞書式符号化（同じ文字列は1つだけ保持し、列には番号だけを持つ）"""
+
+    __slots__ = ("values", "codes")
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+
+    def encode(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            # 文字列でなければ sys.intern が TypeError を出すので、登録より先に行う
+            value = sys.intern(value)
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class _RowView:
+    """
+    RecordTable の1行を namedtuple のように見せるビューの基底クラス
+
+    値はコピーせず、表と行番号だけを持つ（__slots__ で1行あたりのメモリを抑える）。
+    フィールド名の属性は RecordTable ごとに作るサブクラスで定義する。
+    """
+
+    __slots__ = ("_table", "_index")
+    _fields: Tuple[str, ...] = ()
+
+    def __init__(self, table: "RecordTable", index: int):
+        self._table = table
+        self._index = index
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __iter__(self):
+        return (self._table._value(field, self._index) for field in self._fields)
+
+    def __getitem__(self, position: int) -> Any:
+        return self._table._value(self._fields[position], self._index)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (_RowView, tuple)):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        # 同じ値のタプルと等しいので、ハッシュもタプルにそろえる（namedtuple と同じく dict のキーや set に使える）
+        return hash(tuple(self))
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{field}={value!r}" for field, value in zip(self._fields, self))
+        return f"{type(self).__name__}({values})"
+
+    def _asdict(self) -> Dict[str, Any]:
+        return dict(zip(self._fields, self))
+
+
+def _row_type(name: str, fields: Tuple[str, ...]) -> type:
+    """フィールド名の属性を持つ _RowView のサブクラスを作る"""
+    namespace: Dict[str, Any] = {"__slots__": (), "_fields": fields}
+    for field in fields:
+        namespace[field] = property(lambda row, field=field: row._table._value(field, row._index))
+    return type(name, (_RowView,), namespace)
+
+
+class RecordTable:
+    """
+    同じフィールドを持つレコードを、フィールドごとの列として保持する表
+
+    数値のフィールドは array.array（型コード 'q', 'd' など）に詰めて持ち、
+    文字列のフィールドは辞書式符号化して、番号を array('I') に持つ。
+    1レコードごとに namedtuple や dict を作らないので、大量のレコードでもメモリが小さい。
+
+    table[i] は namedtuple のように使える行のビュー（値はコピーしない）を返し、
+    table[a:b] は列を memoryview でスライスした、読み取り専用の表（コピーしない）を返す。
+    列は column() で NumPy 配列として（コピーせずに）読める。
+    スライスや column() の配列が残っている間は、元の表に行を追加できない（array.array の制約）。
+    """
+
+    def __init__(self, schema: Dict[str, Any], name: str = "Record"):
+        """
+        Args:
+            schema: フィールド名をキー、型（array の型コード、または str）を値とする辞書
+            name: 行のビューのクラス名
+        """
+        self._schema = dict(schema)
+        self._columns: Dict[str, Any] = {}
+        self._strings: Dict[str, _StringDictionary] = {}
+        for field, kind in self._schema.items():
+            if kind is str:
+                self._strings[field] = _StringDictionary()
+                self._columns[field] = array("I")
+            else:
+                self._columns[field] = array(kind)
+        self._row_type = _row_type(name, tuple(self._schema))
+        self._length = 0
+        self._readonly = False
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        return tuple(self._schema)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self):
+        return (self._row_type(self, i) for i in range(self._length))
+
+    def __getitem__(self, key: Union[int, slice]) -> Any:
+        if isinstance(key, slice):
+            view = object.__new__(RecordTable)
+            view._schema = self._schema
+            view._strings = self._strings
+            view._row_type = self._row_type
+            # key.indices() の結果を使うと、負の step で stop が -1 になり「末尾」と解釈されてしまう
+            view._columns = {field: memoryview(column)[key] for field, column in self._columns.items()}
+            view._length = len(range(self._length)[key])
+            view._readonly = True
+            return view
+        if key < 0:
+            key += self._length
+        if not 0 <= key < self._length:
+            raise IndexError("行番号が範囲外です")
+        return self._row_type(self, key)
+
+    def _value(self, field: str, index: int) -> Any:
+        """field の index 行目の値（文字列のフィールドは番号から戻す）"""
+        value = self._columns[field][index]
+        strings = self._strings.get(field)
+        return value if strings is None else strings.values[value]
+
+    def append(self, record: Any) -> None:
+        """
+        レコードを1つ追加する
+
+        Args:
+            record: フィールドの順に並んだ値（タプル・namedtuple など）、またはフィールド名をキーとする辞書
+        """
+        if self._readonly:
+            raise TypeError("スライスした表には追加できません")
+        if isinstance(record, dict):
+            record = [record[field] for field in self._schema]
+        if len(record) != len(self._schema):
+            raise ValueError(f"値の数 {len(record)} がフィールドの数 {len(self._schema)} と違います")
+        # 途中で失敗して列の長さがずれないよう、すべての値を変換・検査してから追加する
+        converted = {}
+        for field, value in zip(self._schema, record):
+            if field not in self._strings:
+                converted[field] = array(self._schema[field], [value])
+        for field, value in zip(self._schema, record):
+            if field in self._strings:
+                converted[field] = (self._strings[field].encode(value),)
+        # column() の配列が残っている列だけ BufferError になることがあるので、そのときは元に戻す
+        appended = []
+        try:
+            for field, values in converted.items():
+                self._columns[field].extend(values)
+                appended.append(field)
+        except BufferError:
+            for field in appended:
+                self._columns[field].pop()
+            raise
+        self._length += 1
+
+    def extend(self, records: Any) -> None:
+        """レコードのイテラブルをまとめて追加する"""
+        for record in records:
+            self.append(record)
+
+    def _extend_columns(self, columns: Dict[str, List[str]]) -> None:
+        """CSV から読んだ文字列の列を、型を変換して列の末尾にまとめて追加する"""
+        count = None
+        for field, values in columns.items():
+            kind = self._schema[field]
+            if kind is str:
+                self._columns[field].extend(map(self._strings[field].encode, values))
+            else:
+                convert = float if kind in "fd" else int
+                self._columns[field].extend(array(kind, map(convert, values)))
+            count = len(values)
+        self._length += count or 0
+
+    @classmethod
+    def from_csv(cls, file: Any, schema: Dict[str, Any], name: str = "Record", **reader_options: Any) -> "RecordTable":
+        """
+        CSV（1行目がヘッダ）からレコードをまとめて読み込む
+
+        行を _CSV_CHUNK_ROWS 行ずつ読んで列に並べ替え、列ごとにまとめて変換・追加する。
+        schema にないヘッダの列は読み飛ばす。
+
+        Args:
+            file: CSV ファイルのパス、またはテキストのファイルオブジェクト
+            schema: フィールド名をキー、型（array の型コード、または str）を値とする辞書
+            name: 行のビューのクラス名
+            reader_options: csv.reader に渡すオプション
+
+        Returns:
+            RecordTable: 読み込んだ表
+        """
+        import csv
+
+        if isinstance(file, (str, Path)):
+            with open(file, newline="", encoding="utf-8") as f:
+                return cls.from_csv(f, schema, name, **reader_options)
+        table = cls(schema, name)
+        reader = csv.reader(file, **reader_options)
+        header = next(reader, None)
+        if header is None:
+            return table
+        missing = [field for field in schema if field not in header]
+        if missing:
+            raise ValueError(f"CSV に列がありません: {missing}")
+        positions = {field: header.index(field) for field in schema}
+        while True:
+            rows = list(itertools.islice(reader, _CSV_CHUNK_ROWS))
+            if not rows:
+                break
+            transposed = list(zip(*rows))
+            table._extend_columns({field: transposed[position] for field, position in positions.items()})
+        return table
+
+    def column(self, field: str) -> Any:
+        """
+        列を NumPy 配列として返す（コピーしない。文字列のフィールドは辞書式符号化の番号）
+
+        Args:
+            field: フィールド名
+
+        Returns:
+            np.ndarray: 列の値
+        """
+        import numpy as np
+
+        return np.asarray(memoryview(self._columns[field]))
+
+    def categories(self, field: str) -> List[str]:
+        """文字列のフィールドの、番号に対応する文字列の一覧を返す"""
+        return self._strings[field].values
+
+    @property
+    def nbytes(self) -> int:
+        """列が使っているバイト数（文字列の辞書は含まない）"""
+        return sum(memoryview(column).nbytes for column in self._columns.values())
+
+
+# 各軸の番号に重みを掛けて足した値（100*i + 10*j + k など）を持つ配列 -----------------------------------------
+# index_encoded_array で一度に埋める要素数の目安（大きな配列は軸0に沿ってこの大きさずつ埋める）
+_FILL_SLAB_ELEMENTS = 1 << 23
+
+
+def _decimal_weights(shape: Tuple[int, ...]) -> List[int]:
+    """各軸の番号が10進数の桁として並ぶ重みを返す（(2, 3, 4) なら [100, 10, 1]、(1000,)*3 なら [10**6, 10**3, 1]）"""
+    weights = []
+    weight = 1
+    for size in reversed(shape):
+        weights.append(weight)
+        weight *= 10 ** len(str(max(size - 1, 0)))
+    return weights[::-1]
+
+
+def index_encoded_array(shape: Tuple[int, ...], weights: Optional[List[int]] = None, dtype: Any = "int64",
+                        out: Any = None, path: Optional[str] = None) -> Any:
+    """
+    各要素が「各軸の番号 × 重み」の合計になる配列を作る関数
+
+    3重ループで1要素ずつ代入する代わりに、軸ごとの番号の列 (np.ogrid) をブロードキャストで足し合わせる。
+    軸0以外の部分の合計を一度だけ作り、軸0に沿って少しずつ out に書き込むので、
+    np.memmap に書き込めばメモリより大きな配列も作れる。
+
+    Args:
+        shape: 配列の形
+        weights: 各軸の重み。省略すると各軸の番号が10進数の桁として並ぶ重み（(2, 3, 4) なら 100, 10, 1）。
+                 整数の型では整数の値に限る（浮動小数点数の型では小数もそのまま使う）
+        dtype: 配列の型
+        out: 書き込み先の配列（np.memmap でもよい）。省略すると新しく作る
+        path: out を省略したときに、このファイルを np.memmap として作って書き込む（out とは同時に指定できない）
+
+    Returns:
+        np.ndarray: 作った配列（out または path を指定した場合はその配列）
+    """
+    import numpy as np
+
+    if out is not None and path is not None:
+        raise ValueError("out と path は同時に指定できません")
+    shape = tuple(int(size) for size in shape)
+    dtype = np.dtype(dtype if out is None else out.dtype)
+    if weights is None:
+        weights = _decimal_weights(shape)
+    elif dtype.kind in "iu":
+        # int() で切り捨てると 0.5 などが黙って 0 になるので、整数でない重みはエラーにする
+        if any(w != int(w) for w in weights):
+            raise ValueError(f"整数の型 {dtype} には整数の重みを指定してください: {list(weights)}")
+        weights = [int(w) for w in weights]
+    else:
+        weights = list(weights)
+    if len(weights) != len(shape):
+        raise ValueError(f"重みの数 {len(weights)} が次元数 {len(shape)} と違います")
+    if dtype.kind in "iu" and 0 not in shape:
+        largest = sum(max(w * (size - 1), 0) for w, size in zip(weights, shape))
+        smallest = sum(min(w * (size - 1), 0) for w, size in zip(weights, shape))
+        info = np.iinfo(dtype)
+        if largest > info.max or smallest < info.min:
+            raise OverflowError(f"値が {dtype} に収まりません（{smallest}〜{largest}）")
+
+    if out is None:
+        if path is not None:
+            out = np.memmap(path, dtype=dtype, mode="w+", shape=shape)
+        else:
+            out = np.empty(shape, dtype=dtype)
+    elif out.shape != shape:
+        raise ValueError(f"out の形 {out.shape} が {shape} と違います")
+    if out.size == 0:
+        return out
+    if not shape:
+        out[()] = 0
+        return out
+
+    # 軸0以外の番号 × 重みを、ブロードキャストで足し合わせておく
+    grids = np.ogrid[tuple(slice(0, size) for size in shape[1:])]
+    rest = np.zeros(shape[1:], dtype=dtype)
+    for grid, weight in zip(grids, weights[1:]):
+        rest += (grid * weight).astype(dtype)
+    # 軸0に沿って、一度に _FILL_SLAB_ELEMENTS 要素程度ずつ埋める
+    step = max(1, _FILL_SLAB_ELEMENTS // max(rest.size, 1))
+    for start in range(0, shape[0], step):
+        stop = min(start + step, shape[0])
+        first = (np.arange(start, stop, dtype=dtype) * weights[0]).reshape((-1,) + (1,) * len(rest.shape))
+        np.add(first, rest, out=out[start:stop])
+    if isinstance(out, np.memmap):
+        out.flush()
+    return out
+
+
+def demo_basic_types():
+    """基本的な型（int, float, bool, complex, str）の例"""
+    from icecream import ic
+
+    print("基本的な型")
+    # int型: 整数値を表現。計算、カウント、インデックス参照などに使用
+    print("int型: 整数値を表現。計算、カウント、インデックス参照などに使用")
+    integer_value = 42
+    ic(integer_value)
+    ic(integer_value + 10)# 算術演算
+    ic(integer_value // 10) # 整数除算
+
+    # float型: 小数点を含む数値。科学計算や割合の表現などに使用
+    print("float型: 小数点を含む数値。科学計算や割合の表現などに使用")
+    float_value = 3.14
+    print(float_value)
+    ic(float_value * (5 ** 2))  # 円の面積計算
+
+    # bool型: 真偽値。条件分岐やフラグとして使用
+    print("# bool型: 真偽値。条件分岐やフラグとして使用")
+    boolean_value = True
+    if boolean_value:
+        print("条件は真です")
+    is_active = False  # ユーザーの状態を表すフラグ
+
+    # complex型: 複素数。科学計算や信号処理などに使用
+    print("complex型: 複素数。科学計算や信号処理などに使用")
+    complex_value = 1 + 2j
+    ic(complex_value)
+    magnitude = abs(complex_value)  # 複素数の大きさ
+    ic(magnitude)
+    conjugate = complex_value.conjugate()  # 共役複素数
+    ic(conjugate)
+
+    # str型: 文字列。テキストデータの表現やメッセージ表示などに使用
+    print("str型: 文字列。テキストデータの表現やメッセージ表示などに使用")
+    string_value = "Hello, World!"
+    ic(string_value)
+    greeting = "こんにちは、" + "世界！"  # 文字列連結
+    ic(greeting)
+    multiline = """複数行の
+テキストも
+表現できます"""  # 複数行の文字列
+    ic(multiline)
+
+
+def demo_sequence_types():
+    """シーケンス型（list, tuple, range）の例"""
+    from icecream import ic
+
+    print("シーケンス型")
+    # list型: 順序付き可変コレクション。データの集合や順序が重要な場合に使用
+    print("list型: 順序付き可変コレクション。データの集合や順序が重要な場合に使用")
+    list_value = [1, 2, 3, 4, 5]
+    ic(list_value)
+    list_value.append(6)  # 要素の追加
+    ic(list_value)
+    first_three = list_value[:3]  # スライス処理
+    ic(first_three)
+
+    # tuple型: 順序付き不変コレクション。変更されない値のグループや多値返却に使用
+    print("tuple型: 順序付き不変コレクション。変更されない値のグループや多値返却に使用")
+    tuple_value = (1, 2, 3, 4, 5)
+    ic(tuple_value)
+    x, y, z = (10, 20, 30)  # アンパック
+    ic(x,y,z)
+    point = (3.5, 4.2)  # 座標点など、関連する値のグループ化
+    ic(point)
+
+    # range型: 数値シーケンス。ループの反復回数指定やインデックス生成に使用
+    print("range型: 数値シーケンス。ループの反復回数指定やインデックス生成に使用")
+    range_value = range(10)  # 0から9までの数値シーケンス
+    ic(range_value)
+    for i in range(5):
+        ic(i)  # 0から4まで順に表示（ループ制御）
+    even_numbers = range(0, 10, 2)  # 0, 2, 4, 6, 8（偶数のみ）
+    ic(even_numbers)
+
+
+def demo_mapping_types():
+    """マッピング型（dict）の例"""
+    from icecream import ic
+
+    print("マッピング型")
+    # dict型: キーと値のペアを格納。関連データの検索や構造化に使用
+    print("dict型: キーと値のペアを格納。関連データの検索や構造化に使用")
+    dict_value = {"name": "Alice", "age": 30, "email": "alice@example.com"}
+    ic(dict_value)
+    user_age = dict_value["age"]  # キーによる値の取得
+    ic(user_age)
+    dict_value["location"] = "Tokyo"  # 新しいキー・値の追加
+    ic(dict_value)
+    employee_data = {
+        "id": "E12345",
+        "department": "Engineering",
+        "manager": "Bob Smith"
+    }  # 構造化データの表現
+    ic(employee_data)
+
+
+def demo_set_types():
+    """セット型（set, frozenset）の例"""
+    from icecream import ic
+
+    print("セット型")
+    # set型: 重複のない可変コレクション。一意の値の集合や集合演算に使用
+    print("set型: 重複のない可変コレクション。一意の値の集合や集合演算に使用")
+    set_value = {1, 2, 3, 4, 5}
+    ic(set_value)
+    set_value.add(6)  # 要素の追加
+    ic(set_value)
+    unique_chars = set("mississippi")  # 'm', 'i', 's', 'p'（重複除去）
+    ic(unique_chars)
+    is_member = 3 in set_value  # 所属判定（高速）
+    ic(is_member)
+    tags = {"python", "programming", "tutorial"}  # タグのような一意の識別子
+    ic(tags)
+    ic(type(tags))
+
+    # frozenset型: 重複のない不変コレクション。辞書のキーやセットの要素として使用可能
+    print("frozenset型: 重複のない不変コレクション。辞書のキーやセットの要素として使用可能")
+    frozenset_value = frozenset([1, 2, 3])
+    ic(frozenset_value)
+    # ハッシュ可能なため、辞書のキーに使用可能
+    cache = {frozenset([1, 2]): "data for [1, 2]"}
+    ic(cache)
+
+    # 商品IDの組み合わせごとの割引率
+    discount_rates = {
+        frozenset([101, 102]): 10,  # 商品101と102を一緒に買うと10%オフ
+        frozenset([101, 103, 105]): 15,  # 商品101、103、105を一緒に買うと15%オフ
+    }
+    ic(discount_rates)
+
+    # カートの中の商品
+    cart = [105, 101, 103]
+    ic(cart)
+    # 割引を計算
+    cart_set = frozenset(cart)
+    ic(cart_set)
+    if cart_set in discount_rates:
+        discount = discount_rates[cart_set]
+        print(f"適用される割引率: {discount}%")  # "適用される割引率: 15%" が表示される
+
+    # 実際のカートはバンドルより多くの商品を含むので、カートに含まれるバンドルを探す
+    bundle_index = BundleIndex(discount_rates)
+    larger_cart = [105, 101, 103, 200, 102]
+    ic(bundle_index.matching(larger_cart))
+    ic(bundle_index.best(larger_cart))  # (frozenset({101, 103, 105}), 15)
+
+    # 不変なので、一度生成後は変更不可
+    # frozenset_value.add(4)  # これはエラーになる
+
+
+def demo_binary_types():
+    """バイナリシーケンス型（bytes, bytearray, memoryview）の例"""
+    from icecream import ic
+
+    print("バイナリシーケンス型")
+    # bytes型: 不変バイト列。バイナリデータや文字エンコーディングに使用
+    print("bytes型: 不変バイト列。バイナリデータや文字エンコーディングに使用")
+    bytes_value = b"hello"
+    ic(bytes_value)
+    file_signature = bytes([0x89, 0x50, 0x4E, 0x47])  # PNGファイルの先頭バイト
+    ic(file_signature)
+    encoded = "こんにちは".encode('utf-8')  # 文字列をバイトにエンコード
+    ic(encoded)
+
+    # bytearray型: 可変バイト列。バイナリデータの編集に使用
+    print("bytearray型: 可変バイト列。バイナリデータの編集に使用")
+    bytearray_value = bytearray(b"hello")
+    ic(bytearray_value)
+    bytearray_value[0] = 72  # 'h'を'H'に変更
+    ic(bytearray_value)
+    buffer = bytearray(1024)  # 1KBのバッファ初期化
+    ic(buffer)
+
+    # memoryview型: メモリ内のバイトデータの効率的なアクセスに使用
+    print("memoryview型: メモリ内のバイトデータの効率的なアクセスに使用、大規模なバイナリデータに有用")
+    memoryview_value = memoryview(bytes_value)
+    ic(memoryview_value)
+    first_byte = memoryview_value[0]  # コピーなしでデータにアクセス
+    ic(first_byte)
+    slice_view = memoryview_value[1:3]  # コピーなしでスライス処理
+    ic(slice_view)
+
+
+def demo_other_types():
+    """その他の型（None, type, object, Ellipsis, NotImplemented）の例"""
+    from icecream import ic
+
+    print("その他の型")
+    # None型: 値の不在を表す。初期化や関数の戻り値などに使用
+    print("None型: 値の不在を表す。初期化や関数の戻り値などに使用")
+    none_value = None
+    ic(none_value)
+    ic(optional_operation())
+
+    # type型: オブジェクトの型を表す。型チェックや動的オブジェクト生成に使用
+    print("type型: オブジェクトの型を表す。型チェックや動的オブジェクト生成に使用")
+    type_value = type(42)  # <class 'int'>
+    ic(type_value)
+    if type("hello") is str:
+        print("これは文字列です")
+
+    # object型: 全てのクラスの基底。汎用オブジェクトやプレースホルダとして使用
+    print("object型: 全てのクラスの基底。汎用オブジェクトやプレースホルダとして使用")
+    object_value = object()
+    ic(object_value)
+
+    # Ellipsis型: 省略記号。多次元配列のスライスや未実装部分の表現に使用
+    print("Ellipsis型: 省略記号。多次元配列のスライスや未実装部分の表現に使用")
+    ellipsis_value = ...
+    ic(ellipsis_value)
+    # NumPyなどでの次元指定
+    # array[..., 0] は全ての次元の最初の要素
+    import numpy as np
+    array = np.zeros((5, 5, 5))  # 3次元配列
+    ic(array)
+    # 最初の次元はすべて、最後の次元は0番目の要素を取得
+    subset = array[..., 0]
+    ic(subset)
+    # これは以下と同等:
+    subset2 = array[:, :, 0]
+    ic(subset2)
+
+    # 具体例
+    array = np.zeros((2, 3, 4))  # 2x3x4の3次元配列
+
+    # 各要素を一意に特定できる値で埋める
+    # 100*i + 10*j + k の形式で値を設定（i,j,kはそれぞれの次元のインデックス）
+    for i in range(2):
+        for j in range(3):
+            for k in range(4):
+                array[i, j, k] = 100*i + 10*j + k
+
+    # 同じ配列はループを使わずに index_encoded_array で作れる
+    ic((array == index_encoded_array(array.shape)).all())
+
+    # 配列全体を表示
+    print("===== 元の3次元配列 =====")
+    ic(array)
+    ic("\n形状:", array.shape)  # (2, 3, 4)
+
+    print("\n===== array[..., 0] の結果 =====")
+    subset = array[..., 0]
+    ic(subset)
+    ic("\n形状:", subset.shape)  # (2, 3)
+
+    # NotImplemented型: 特殊メソッドが特定の入力に対応していないことを示す
+    print("NotImplemented型: 特殊メソッドが特定の入力に対応していないことを示す")
+    notimplemented_value = NotImplemented
+    ic(notimplemented_value)
+
+    a = CustomNumber()
+    b = CustomNumber()
+    c = a + b  # 動作する（CustomNumber インスタンスを返す）
+    # d = a + 5  # NotImplemented が返されるので、int.__radd__(a) が試されるがこれも実装されていないため、TypeError が発生
+
+
+def demo_collections():
+    """コレクション関連（collections モジュール）の例"""
+    import io
+
+    print("コレクション関連（importが必要）")
+
+    # namedtuple: フィールド名を持つタプル。小さなデータ構造やレコードに使用
+    Person = collections.namedtuple('Person', ['name', 'age'])
+    person = Person("Bob", 25)
+    print(person.name)  # 名前付きフィールドでアクセス
+    # データベースの行やCSVレコードの表現に最適
+    # 大量のレコードは、列ごとに array に詰める RecordTable の方がメモリが小さい
+    people = RecordTable({"name": str, "age": "b"}, name="Person")
+    people.extend([("Bob", 25), ("Alice", 30), ("Bob", 41)])
+    print(people[0].name, people[0], list(people[1:]))
+    ages = people.column("age")  # 列は NumPy 配列としてコピーせずに読める
+    print(ages.mean(), people.categories("name"), people.nbytes)
+    csv_people = RecordTable.from_csv(io.StringIO("name,age\nCarol,35\nDave,28\n"), {"name": str, "age": "b"}, name="Person")
+    print(csv_people[1], csv_people[1]._asdict())
+
+    # deque: 両端キュー。両端からの高速な挿入・削除が必要な場合に使用
+    deque_value = collections.deque([1, 2, 3])
+    deque_value.appendleft(0)  # 左端に追加
+    deque_value.pop()  # 右端から削除
+    # キュー、スタック、または固定サイズバッファとして使用
+
+    # ChainMap: 複数の辞書を結合。設定の階層や検索順序が必要な場合
+    chainmap_value = collections.ChainMap({'a': 1}, {'b': 2}, {'a': 3})
+    # 最初のマップで見つかった値が使用される: chainmap_value['a'] は 1
+    # 設定の階層（デフォルト→ユーザー設定→一時的な設定）などに使用
+
+    # Counter: 要素のカウント。頻度分析や集計に使用
+    counter_value = collections.Counter(['a', 'b', 'a', 'c', 'a'])
+    most_common = counter_value.most_common(2)  # [('a', 3), ('b', 1)]
+    # テキスト分析、投票集計、インベントリ管理などに有用
+
+    # OrderedDict: 挿入順序を保持する辞書。順序が重要な場合に使用
+    ordered_dict = collections.OrderedDict([('a', 1), ('b', 2)])
+    ordered_dict['c'] = 3  # 挿入順で保持
+    # Python 3.7以降では通常のdictも順序を保持するが、明示的な意図の表現に使用
+
+    # defaultdict: キーが存在しない場合にデフォルト値を提供する辞書
+    default_dict = collections.defaultdict(int)  # 存在しないキーに対して0を返す
+    default_dict['a'] += 1  # 'a'が存在しなくても、エラーにならず1になる
+    # グループ化や頻度カウントなどに便利
+    word_counts = collections.defaultdict(int)
+    for word in ["apple", "banana", "apple", "orange"]:
+        word_counts[word] += 1
+
+
+def demo_type_hints():
+    """型ヒント関連の例"""
+    print("型ヒント関連")
+
+    # List: 特定の型のリスト。要素の型を統一したいコレクションに使用
+    numbers: List[int] = [1, 2, 3]
+    # 数値のみのリストであることを明示
+
+    # Dict: キーと値の型を指定した辞書。構造化データの型定義に使用
+    name_ages: Dict[str, int] = {"Alice": 30, "Bob": 25}
+    # 文字列をキー、整数を値とする辞書であることを明示
+
+    # Set: 特定の型の集合。一意の値のコレクションの型定義に使用
+    unique_numbers: Set[int] = {1, 2, 3}
+    # 整数のセットであることを明示
+
+    # Tuple: 複数の型からなるタプル。固定長の異なる型の集合に使用
+    coordinates: Tuple[float, float] = (10.5, 20.3)
+    # 2つの浮動小数点数からなる座標のような構造
+
+    # Union: 複数の型のいずれか。多様な型を受け入れる場合に使用
+    result: Union[int, str] = "success"
+    # 整数か文字列のいずれかであることを示す
+
+    # Optional: 特定の型またはNone。値が存在しない可能性がある場合に使用
+    maybe_name: Optional[str] = None  # str | None と同等
+    # 文字列またはNoneであることを示す
+
+    # Any: 任意の型。型制約がない場合に使用（なるべく避けるべき）
+    anything: Any = 42  # どんな型でも許容
+    # 型チェックを一部分だけ無効にしたい場合や、動的な型の場合に使用
+
+    # Callable: 呼び出し可能なオブジェクト。関数やメソッドの型定義に使用
+    callback: Callable[[int, int], int] = lambda x, y: x + y
+    # 2つのintを引数に取り、intを返す関数であることを示す
+
+
+def main():
+    """すべての例を順に実行する"""
+    demo_basic_types()
+    demo_sequence_types()
+    demo_mapping_types()
+    demo_set_types()
+    demo_binary_types()
+    demo_other_types()
+    demo_collections()
+    demo_type_hints()
+
+
+def measure_import_time(module="type"):
+    """
+    python -X importtime で、このモジュールを import したときの時間を計測する
+
+    別のプロセスで import し、標準エラー出力の importtime の表から
+    このモジュール自身と、重い依存モジュール（numpy, icecream）の行を取り出す。
+
+    Args:
+        module: 計測するモジュール名
+
+    Returns:
+        dict: モジュール名をキー、累積の import 時間（マイクロ秒）を値とする辞書
+              （import されなかったモジュールは含まない）
+    """
+    import subprocess
+
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=Path(__file__).resolve().parent, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        # 形式: "import time:   self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line.split("|"))
+        if name in (module, "numpy", "icecream"):
+            times[name] = int(cumulative)
+    return times
+
+
+if __name__ == "__main__":
+    if "--importtime" in sys.argv[1:]:
+        times = measure_import_time()
+        for name, microseconds in times.items():
+            print(f"{name}: {microseconds / 1000:.1f} ms")
+        for name in ("numpy", "icecream"):
+            if name not in times:
+                print(f"{name}: 読み込まれていません")
+    else:
+        main()
@@ -1,4 +1,15 @@
+import collections
+import importlib.util
 import math 
+import operator
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from multiprocessing import shared_memory
+from pathlib import Path
+
+import numpy as np
 
 def lcm(num1,num2):
     """
@@ -11,30 +22,630 @@ def lcm(num1,num2):
     Returns:
          最小公倍数
     """
+    if num1 == 0 or num2 == 0:
+        return 0
     # 最小公倍数 = (num1 * num2 ) / 最大公約数
-    return (num1 * num2 )// math.gcd(num1,num2)
+    # 先に割ってから掛けると、途中の値が num1 * num2 より大きくならない
+    return num1 // math.gcd(num1,num2) * num2
+
+
+def _lcm_tree(numbers):
+    """
+    整数のイテラブルを、2つずつ組にしながら最小公倍数をとる（積の木）
+
+    左から1つずつ掛けていくと、大きくなり続ける途中の値と毎回計算することになるが、
+    同じくらいの大きさのもの同士を組にすると全体の計算量が小さくなる。
+    イテラブルは1回だけ読み、コピーしない。同じ値は一度だけ使い、0 があればその時点で 0 を返す。
+
+    Args:
+        numbers: 整数のイテラブル
+
+    Returns:
+        int: 最小公倍数（空なら 0）
+
+    Raises:
+        TypeError: 整数でない値が含まれる場合
+    """
+    # 二進カウンタのように、同じ高さの値が2つそろったら組にして1つ上の高さに積む
+    stack = []
+    seen = set()
+    for value in numbers:
+        # int() だと 2.5 などを黙って切り捨てるので、整数以外は TypeError にする
+        value = abs(operator.index(value))
+        if value == 0:
+            return 0
+        if value in seen:
+            continue
+        seen.add(value)
+        height = 0
+        while stack and stack[-1][0] == height:
+            value = lcm(stack.pop()[1], value)
+            height += 1
+        stack.append((height, value))
+    if not stack:
+        return 0
+    # 残った値を、小さい（低い）ものから順にまとめる
+    result = stack.pop()[1]
+    while stack:
+        result = lcm(stack.pop()[1], result)
+    return result
+
+
+def _lcm_array(values):
+    """
+    整数の NumPy 配列の最小公倍数を、np.lcm で2つずつ組にしながら求める
+
+    各段で int64 からあふれないかを調べ、あふれる場合はその段の値を
+    Python の整数にして _lcm_tree で続きを計算する。
+
+    Args:
+        values: 整数の NumPy 配列
+
+    Returns:
+        int: 最小公倍数（空なら 0）
+    """
+    values = values.ravel()
+    if values.size == 0:
+        return 0
+    limit = np.iinfo(np.int64).max
+    # int64 に収まらない値や、絶対値をとれない最小値は Python の整数で計算する
+    if (values.dtype.kind == "u" and values.max() > limit) or (values.dtype.kind == "i" and values.min() < -limit):
+        return _lcm_tree(values.tolist())
+    values = np.unique(np.abs(values.astype(np.int64)))
+    if values[0] == 0:
+        return 0
+    while len(values) > 1:
+        if len(values) % 2:
+            values = np.append(values, 1)
+        left, right = values[0::2], values[1::2]
+        quotient = left // np.gcd(left, right)
+        if (quotient > limit // right).any():
+            return _lcm_tree(values.tolist())
+        values = np.lcm(left, right)
+    return int(values[0])
 
 
 def lcm_of_multiple_numbers(numbers):
     """
     任意の数のリストの最小公倍数を計算する関数
 
+    リストに限らず任意のイテラブルを受け取り、2つずつ組にしながら計算する。
+    整数の NumPy 配列は np.lcm でまとめて計算し、int64 からあふれる場合は Python の整数に切り替える。
+
     Args:
-        numbers: 数値のリスト
+        numbers: 数値のリスト（イテラブルまたは NumPy 配列でもよい）
 
     Returns:
-        最小公倍数
+        最小公倍数（0 以上。空なら 0）
     """
-    if not numbers:
-        return 0
-    # 先頭の値を取得
-    result = numbers[0]
-    # 先頭の値との最小公倍数を取得していってそれと後続の最小公倍数を求めていく
-    for num in numbers[1:]:
-        result = lcm(result,num)
-    return result 
+    if isinstance(numbers, np.ndarray) and numbers.dtype.kind in "iu":
+        return _lcm_array(numbers)
+    return _lcm_tree(numbers)
+
+
+# ==== 周期の集合の最小公倍数・最大公約数 ====
+# 素因数分解に使う prime_numbers.py の場所（ディレクトリ名にハイフンがあり import できないため、パスで読み込む）
+_PRIME_NUMBERS_PATH = Path(__file__).resolve().parent.parent / "day-00005_2025-03-01" / "prime_numbers.py"
+_PRIME_NUMBERS = None
+
+
+def _prime_numbers():
+    """prime_numbers.py を初めて使うときに読み込む"""
+    global _PRIME_NUMBERS
+    if _PRIME_NUMBERS is None:
+        spec = importlib.util.spec_from_file_location("prime_numbers", _PRIME_NUMBERS_PATH)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _PRIME_NUMBERS = module
+    return _PRIME_NUMBERS
+
+
+@lru_cache(maxsize=1 << 16)
+def _factor_items(n):
+    """n の素因数分解を ((素数, 指数), ...) で返す（同じ周期は何度も分解しない）"""
+    return tuple(_prime_numbers().factorize(n).items())
+
+
+class PeriodSet:
+    """
+    周期（正の整数）の多重集合と、その最小公倍数を保持するクラス
+
+    各周期を素因数分解した指数の表を使い、素数ごとに「指数の多重集合」を持つ。
+    最小公倍数は各素数の指数の最大値で決まるので、追加・削除のたびに
+    その周期の素因数の分だけ更新すればよく、集合の大きさによらない。
+    素因数分解は prime_numbers.factorize（最小素因数表を使う）で行い、結果はキャッシュする。
+    """
+
+    def __init__(self, periods=()):
+        """
+        Args:
+            periods: 最初に追加する周期のイテラブル
+        """
+        # 周期ごとの個数
+        self._counts = collections.Counter()
+        # 素数ごとの、指数の多重集合 {指数: その指数を持つ周期の数}
+        self._exponents = {}
+        # 素数ごとの指数の最大値
+        self._max_exponents = {}
+        self._size = 0
+        self._lcm = 1
+        for period in periods:
+            self.add(period)
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, period):
+        return self._counts[period] > 0
+
+    def __iter__(self):
+        return self._counts.elements()
+
+    @property
+    def lcm(self):
+        """集合の最小公倍数（空なら 1）"""
+        return self._lcm
+
+    def lcm_factors(self):
+        """
+        最小公倍数の素因数分解を返す
+
+        Returns:
+            dict: 素因数をキー、指数を値とする辞書（素因数の昇順）
+        """
+        return dict(sorted(self._max_exponents.items()))
+
+    def gcd(self):
+        """
+        集合の最大公約数を求める（素数ごとに、すべての周期が持つ指数の最小値をとる）
+
+        Returns:
+            int: 最大公約数（空なら 0）
+        """
+        if not self._size:
+            return 0
+        result = 1
+        for p, exponents in self._exponents.items():
+            # すべての周期が p で割り切れるときだけ、最小の指数が効く
+            if sum(exponents.values()) == self._size:
+                result *= p ** min(exponents)
+        return result
+
+    def add(self, period):
+        """
+        周期を1つ追加する
+
+        Args:
+            period: 周期（正の整数）
+        """
+        if period < 1:
+            raise ValueError(f"周期は正の整数にしてください: {period}")
+        self._counts[period] += 1
+        self._size += 1
+        for p, e in _factor_items(period):
+            exponents = self._exponents.setdefault(p, collections.Counter())
+            exponents[e] += 1
+            current = self._max_exponents.get(p, 0)
+            if e > current:
+                self._max_exponents[p] = e
+                self._lcm *= p ** (e - current)
+
+    def remove(self, period):
+        """
+        周期を1つ削除する
+
+        Args:
+            period: 周期
+
+        Raises:
+            KeyError: 周期が集合にない場合
+        """
+        if self._counts[period] == 0:
+            del self._counts[period]
+            raise KeyError(period)
+        self._counts[period] -= 1
+        if self._counts[period] == 0:
+            del self._counts[period]
+        self._size -= 1
+        for p, e in _factor_items(period):
+            exponents = self._exponents[p]
+            exponents[e] -= 1
+            if exponents[e]:
+                continue
+            del exponents[e]
+            if e < self._max_exponents[p]:
+                continue
+            # 最大の指数を持つ周期がなくなったので、残りの指数の最大値にする
+            new = max(exponents, default=0)
+            if new:
+                self._max_exponents[p] = new
+            else:
+                del self._max_exponents[p]
+                del self._exponents[p]
+            self._lcm //= p ** (e - new)
+
+    def discard(self, period):
+        """周期が集合にあれば1つ削除する"""
+        if period in self:
+            self.remove(period)
+
+
+# ==== ルールを指定できる FizzBuzz（大量の出力向け） ====
+# 3の倍数は Fizz、5の倍数は Buzz（両方なら FizzBuzz）
+FIZZBUZZ_RULES = ((3, "Fizz"), (5, "Buzz"))
+
+# 1つのブロックの行数の上限（1回の write がおよそ 1MB になる）
+_BLOCK_ROWS = 1 << 17
+# 上位の桁が変わったサブブロックがこの数以下なら、サブブロックごとに書き換える
+_SCALAR_UPDATES = 8
+
+
+def _check_rules(rules):
+    """ルールを (割る数, ラベルのバイト列) のタプルにそろえる"""
+    rules = tuple((int(divisor), label.encode()) for divisor, label in rules)
+    for divisor, _ in rules:
+        if divisor <= 0:
+            raise ValueError(f"割る数は正の整数にしてください: {divisor}")
+    return rules
+
+
+def fizzbuzz_label(n, rules=FIZZBUZZ_RULES):
+    """
+    n に対して出力する文字列を返す関数
+
+    n を割り切るルールのラベルをルールの順に連結する。どのルールにも当てはまらなければ n そのもの。
+
+    Args:
+        n: 数
+        rules: (割る数, ラベル) のリスト
+
+    Returns:
+        str: 出力する文字列
+    """
+    label = "".join(label for divisor, label in rules if n % divisor == 0)
+    return label or str(n)
+
+
+def _cycle_labels(rules, period):
+    """1周期分のラベルの表を作る（labels[n % period] が n のラベル、数を出力する場合は None）"""
+    labels = [b"" for _ in range(period)]
+    for divisor, label in rules:
+        for r in range(0, period, divisor):
+            labels[r] += label
+    return [label or None for label in labels]
+
+
+def _render(lo, hi, labels):
+    """lo 以上 hi 未満の各数の行を1つずつ作って連結する（ブロックにできない端の部分に使う）"""
+    period = len(labels)
+    return b"".join((labels[n % period] or b"%d" % n) + b"\n" for n in range(lo, hi))
+
+
+def _render_block(first, rows, labels, width):
+    """
+    first から始まる rows 行のブロックを NumPy でまとめて作る
+
+    ラベルの行は周期内の位置ごとに同じバイト列をまとめて書き、
+    数の行は各桁をまとめて計算して書く（1つずつ str() にしない）。
+
+    Args:
+        first: 最初の数（周期の倍数）
+        rows: ブロックの行数（周期の倍数）
+        labels: _cycle_labels の表
+        width: 数の桁数（ブロック内の数はすべてこの桁数）
+
+    Returns:
+        tuple: (ブロックのバイト列の np.uint8 配列, 数の行の先頭のバイト位置の配列, 数の行の行番号の配列)
+    """
+    period = len(labels)
+    # ブロックの先頭は period の倍数なので、行 i のラベルは labels[i % period]
+    lengths = np.array([width + 1 if label is None else len(label) + 1 for label in labels], dtype=np.int64)
+    numeric = np.array([label is None for label in labels])
+    row_lengths = np.tile(lengths, rows // period)
+    ends = np.cumsum(row_lengths)
+    starts = ends - row_lengths
+    view = np.empty(int(ends[-1]), dtype=np.uint8)
+    view[ends - 1] = ord("\n")
+    for r, label in enumerate(labels):
+        if label is not None:
+            view[starts[r::period, None] + np.arange(len(label))] = np.frombuffer(label, dtype=np.uint8)
+    rows_index = np.flatnonzero(np.tile(numeric, rows // period))
+    numbers = first + rows_index
+    number_starts = starts[rows_index]
+    for k in range(width):
+        view[number_starts + k] = numbers // 10 ** (width - 1 - k) % 10 + ord("0")
+    return view, number_starts, rows_index
+
+
+def _low_digits(period, width):
+    """
+    ブロックが _BLOCK_ROWS 行に収まる範囲で、ブロックでそろえる下位の桁数 m をなるべく大きくとる
+
+    Args:
+        period: ラベルの周期
+        width: 数の桁数
+
+    Returns:
+        int: 下位の桁数 m（0 ならブロックにできない）
+    """
+    low_digits = 0
+    for m in range(1, width):
+        if period // math.gcd(period, 10 ** m) * 10 ** m > _BLOCK_ROWS:
+            break
+        low_digits = m
+    return low_digits
+
+
+def _fizzbuzz_chunks(start, stop, rules):
+    """
+    start 以上 stop 以下の出力を、大きなバイト列に分けて返すジェネレータ
+
+    同じ桁数の数が続く区間では、下位 m 桁と周期 P の両方がそろう
+    R = lcm(P, 10^m) 行を1ブロックとし、最初のブロックだけを作る。
+    次のブロックは数が R 増えるだけで、ラベルの並びと下位 m 桁は変わらないので、
+    上位の桁のうち変わった文字だけをバッファに書き換えて、同じバッファをそのまま出力する。
+    返すバッファは次のブロックで書き換わるので、受け取った側ですぐに使うこと。
+
+    Args:
+        start: 最初の数
+        stop: 最後の数
+        rules: _check_rules でそろえたルール
+
+    Yields:
+        bytes または memoryview: 出力するバイト列
+    """
+    period = lcm_of_multiple_numbers([divisor for divisor, _ in rules]) if rules else 1
+    labels = _cycle_labels(rules, period)
+    n = start
+    while n <= stop:
+        # n と同じ桁数の数の区間 [n, end)
+        width = len(str(n))
+        end = min(stop + 1, 10 ** width)
+        low_digits = _low_digits(period, width)
+        if low_digits == 0:
+            for lo in range(n, end, _BLOCK_ROWS):
+                yield _render(lo, min(lo + _BLOCK_ROWS, end), labels)
+            n = end
+            continue
+
+        sub_rows = 10 ** low_digits
+        rows = lcm(period, sub_rows)
+        first = -(-n // rows) * rows
+        if first + rows > end:
+            yield _render(n, end, labels)
+            n = end
+            continue
+        yield _render(n, first, labels)
+
+        # 最初のブロックを作り、以降は上位の桁だけを書き換える
+        view, starts, rows_index = _render_block(first, rows, labels, width)
+        owners = rows_index // sub_rows
+        # サブブロック j の数の行は starts[bounds[j]:bounds[j + 1]]
+        bounds = np.searchsorted(owners, np.arange(rows // sub_rows + 1))
+        prefix_width = width - low_digits
+        # 各サブブロックの上位の桁の値
+        prefixes = first // sub_rows + np.arange(rows // sub_rows, dtype=np.int64)
+        block = first
+        while True:
+            yield memoryview(view)
+            block += rows
+            if block + rows > end:
+                break
+            new_prefixes = prefixes + rows // sub_rows
+            # 下の桁から順に、変わった文字だけを書き換える（ある桁より上が同じなら、それより上の桁も同じ）
+            for k in range(prefix_width):
+                scale = 10 ** k
+                old_quotients, new_quotients = prefixes // scale, new_prefixes // scale
+                changed = old_quotients != new_quotients
+                count = np.count_nonzero(changed)
+                if count == 0:
+                    break
+                digits = (new_quotients % 10 + ord("0")).astype(np.uint8)
+                position = prefix_width - 1 - k
+                if count <= _SCALAR_UPDATES:
+                    # 変わったサブブロックが少なければ、サブブロックごとに同じ文字を書く
+                    for j in np.flatnonzero(changed).tolist():
+                        view[starts[bounds[j]:bounds[j + 1]] + position] = digits[j]
+                elif count == len(changed):
+                    view[starts + position] = digits[owners]
+                else:
+                    rows_changed = changed[owners]
+                    view[starts[rows_changed] + position] = digits[owners[rows_changed]]
+            prefixes = new_prefixes
+        yield _render(block, end, labels)
+        n = end
+
+
+def write_fizzbuzz(stop, rules=FIZZBUZZ_RULES, start=1, out=None):
+    """
+    start から stop までの FizzBuzz を、まとめたバイト列で書き出す関数
+
+    1行ずつ print() する代わりに、周期 lcm(割る数) ごとに同じ並びになることを使って
+    ブロック単位で作り、out.write() をまとめて呼ぶ。
+
+    Args:
+        stop: 最後の数
+        rules: (割る数, ラベル) のリスト
+        start: 最初の数（1以上）
+        out: 書き出し先のバイナリストリーム（省略すると標準出力）
+    """
+    if start < 1:
+        raise ValueError(f"start は1以上にしてください: {start}")
+    if out is None:
+        sys.stdout.flush()
+        out = sys.stdout.buffer
+    for chunk in _fizzbuzz_chunks(start, stop, _check_rules(rules)):
+        out.write(chunk)
+    out.flush()
+
+# ==== 複数プロセスでの書き出し ====
+# 1つのタスクで作る行数の目安（ブロックの行数の倍数に切り上げる）
+PARALLEL_CHUNK_ROWS = 1 << 22
+
+
+def _output_size(lo, hi, labels):
+    """
+    lo 以上 hi 未満の出力のバイト数を、行を作らずに求める
+
+    Args:
+        lo: 最初の数
+        hi: 最後の数の次
+        labels: _cycle_labels の表
+
+    Returns:
+        int: 出力のバイト数
+    """
+    period = len(labels)
+    # 周期内の先頭からの、数の行の個数とラベルの行のバイト数の累積
+    numeric_counts, label_bytes = [0], [0]
+    for label in labels:
+        numeric_counts.append(numeric_counts[-1] + (label is None))
+        label_bytes.append(label_bytes[-1] + (0 if label is None else len(label) + 1))
+
+    def below(table, n):
+        """0 以上 n 未満の数についての table の合計"""
+        q, r = divmod(n, period)
+        return q * table[period] + table[r]
+
+    size = 0
+    n = lo
+    while n < hi:
+        width = len(str(n))
+        end = min(hi, 10 ** width)
+        size += (below(numeric_counts, end) - below(numeric_counts, n)) * (width + 1)
+        size += below(label_bytes, end) - below(label_bytes, n)
+        n = end
+    return size
+
+
+def _attach_shared(name):
+    """
+    親プロセスが作った共有メモリにつなぐ（後始末は親プロセスに任せる）
+
+    Python 3.13 からは track=False で resource_tracker に登録しない。
+    それより前は track を指定できないので、そのままつなぐ。
+    ワーカーは親と同じ resource_tracker を使う（_start_resource_tracker）ので、
+    登録は親の登録と重なるだけで、親の unlink で一緒に取り消される。
+    ここで登録を取り消すと、親の登録まで消えてしまう。
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+def _start_resource_tracker():
+    """ワーカーを起動する前に resource_tracker を起動し、ワーカーに親と同じものを使わせる"""
+    if sys.version_info < (3, 13) and os.name == "posix":
+        from multiprocessing import resource_tracker
+
+        resource_tracker.ensure_running()
+
+
+def _render_chunk_task(name, lo, hi, rules):
+    """
+    lo 以上 hi 未満の出力を、共有メモリ name に書き込む（ワーカープロセスで実行する）
+
+    Args:
+        name: 親プロセスが作った共有メモリの名前
+        lo: 最初の数
+        hi: 最後の数の次
+        rules: _check_rules でそろえたルール
+
+    Returns:
+        int: 書き込んだバイト数
+    """
+    shm = _attach_shared(name)
+    try:
+        offset = 0
+        for chunk in _fizzbuzz_chunks(lo, hi - 1, rules):
+            shm.buf[offset:offset + len(chunk)] = chunk
+            offset += len(chunk)
+    finally:
+        shm.close()
+    return offset
+
+
+def _write_shared(task, out):
+    """タスクの完了を待って、共有メモリの内容を out に書き出し、共有メモリを解放する"""
+    shm, future = task
+    try:
+        size = future.result()
+        with shm.buf[:size] as view:
+            out.write(view)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def write_fizzbuzz_parallel(stop, rules=FIZZBUZZ_RULES, start=1, out=None, workers=None,
+                            chunk_rows=PARALLEL_CHUNK_ROWS):
+    """
+    start から stop までの FizzBuzz を、複数プロセスで作って順番どおりに書き出す関数
+
+    範囲をブロックの行数の倍数にそろえたタスクに分け、各ワーカーは
+    親プロセスが用意した共有メモリ（出力のバイト数は事前に計算できる）に直接書き込む。
+    親プロセスはタスクを投入した順に完了を待って書き出すので、出力の順番は変わらない。
+    書き出しを待つタスクはワーカー数の2倍までにして、メモリの使用量を抑える。
+
+    Args:
+        stop: 最後の数
+        rules: (割る数, ラベル) のリスト
+        start: 最初の数（1以上）
+        out: 書き出し先のバイナリストリーム（省略すると標準出力）
+        workers: ワーカープロセス数。None なら CPU コア数
+        chunk_rows: 1つのタスクで作る行数の目安
+    """
+    if start < 1:
+        raise ValueError(f"start は1以上にしてください: {start}")
+    rules = _check_rules(rules)
+    workers = workers or os.cpu_count() or 1
+    if out is None:
+        sys.stdout.flush()
+        out = sys.stdout.buffer
+
+    # タスクの境界をブロックの行数の倍数にそろえ、タスクの途中でブロックが切れないようにする
+    period = lcm_of_multiple_numbers([divisor for divisor, _ in rules]) if rules else 1
+    labels = _cycle_labels(rules, period)
+    block_rows = lcm(period, 10 ** _low_digits(period, len(str(stop))))
+    step = -(-chunk_rows // block_rows) * block_rows
+    edges = [start] + list(range(start // step * step + step, stop + 1, step)) + [stop + 1]
+    bounds = [(lo, hi) for lo, hi in zip(edges, edges[1:]) if lo < hi]
+
+    if workers == 1 or len(bounds) <= 1:
+        for lo, hi in bounds:
+            for chunk in _fizzbuzz_chunks(lo, hi - 1, rules):
+                out.write(chunk)
+        out.flush()
+        return
+
+    _start_resource_tracker()
+    pending = collections.deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        try:
+            for lo, hi in bounds:
+                shm = shared_memory.SharedMemory(create=True, size=max(1, _output_size(lo, hi, labels)))
+                pending.append((shm, executor.submit(_render_chunk_task, shm.name, lo, hi, rules)))
+                if len(pending) >= 2 * workers:
+                    _write_shared(pending.popleft(), out)
+            while pending:
+                _write_shared(pending.popleft(), out)
+        finally:
+            for shm, future in pending:
+                future.cancel()
+                shm.close()
+                shm.unlink()
+    out.flush()
+
 
 if __name__ == "__main__":
+    # 引数があれば、その数までの FizzBuzz をまとめて書き出す（例: python fizzbuzz.py 1000000000 > out.txt）
+    # 2つ目の引数にワーカー数を指定すると、複数プロセスで作る（例: python fizzbuzz.py 1000000000 8 > out.txt）
+    if len(sys.argv) > 2:
+        write_fizzbuzz_parallel(int(sys.argv[1]), workers=int(sys.argv[2]))
+        sys.exit()
+    if len(sys.argv) > 1:
+        write_fizzbuzz(int(sys.argv[1]))
+        sys.exit()
 
     print(lcm(3,5))
     print(lcm_of_multiple_numbers([7,3,4]))
@@ -1,5 +1,241 @@
-for i in range(1,101):
-    if i %2 == 0:
-        print("even")
-    else: 
-        print("odd")
\ No newline at end of file
+#!/usr/bin/env python3
+"""
+偶数・奇数判定
+
+大量の整数に「even」「odd」のタグを付けて書き出すためのモジュールです：
+- parity: NumPy 配列や array('q') を `& 1` でまとめて判定する
+- render_parity: 判定結果を、16個分ずつ事前に作っておいた "even\\n" / "odd\\n" の並びに置き換える
+- write_parity: 整数の列をチャンクに分け、チャンクごとに1回の write で書き出す
+- parity_from_stream: ファイルや標準入力のテキストを、最後の桁だけを見て判定する
+
+実行例:
+    python even_odd.py                    # 1から100までを判定して表示する
+    python even_odd.py ids.txt > out.txt  # ファイルの整数（空白・改行区切り）を判定する
+    cat ids.txt | python even_odd.py -    # 標準入力から読み込む
+"""
+
+import sys
+from array import array
+from functools import lru_cache
+from itertools import islice
+
+import numpy as np
+
+# 1回の write でまとめて書き出す整数の個数
+CHUNK_SIZE = 1 << 20
+# ファイルから一度に読み込むバイト数
+READ_SIZE = 1 << 22
+
+# 偶数（0）と奇数（1）のときに出力するバイト列
+_WORDS = (b"even\n", b"odd\n")
+
+# 整数の区切りとして扱う空白文字
+_SPACES = b" \t\n\r\v\f"
+# 各バイトの種類の表（空白・数字・符号・それ以外）。数字以外の文字の分類に使う
+_SPACE, _DIGIT, _SIGN, _OTHER = range(4)
+_BYTE_CLASS = np.full(256, _OTHER, dtype=np.uint8)
+_BYTE_CLASS[list(_SPACES)] = _SPACE
+_BYTE_CLASS[list(b"0123456789")] = _DIGIT
+_BYTE_CLASS[list(b"+-")] = _SIGN
+
+
+def parity(values):
+    """
+    整数の列をまとめて偶数・奇数判定する関数
+
+    NumPy 配列と array.array はコピーせずに `& 1` で判定する。
+    それ以外のイテラブルは1つずつ `& 1` をとる（int64 に収まらない整数も扱える）。
+
+    Args:
+        values: 整数の NumPy 配列、array.array、またはイテラブル
+
+    Returns:
+        np.ndarray: 偶数なら 0、奇数なら 1 の np.uint8 配列
+    """
+    if isinstance(values, array):
+        values = np.frombuffer(values, dtype=values.typecode)
+    if isinstance(values, np.ndarray):
+        return (values & 1).astype(np.uint8, copy=False)
+    return np.fromiter((value & 1 for value in values), dtype=np.uint8)
+
+
+@lru_cache(maxsize=None)
+def _pattern_table():
+    """
+    16個分の判定結果（2バイトにまとめたもの）から、出力するバイト列を引く表を作る
+
+    256通りの8個分の並びを作り、それを2つつなげて 65536 通りにする。
+    """
+    byte_patterns = [b"".join(_WORDS[(b >> (7 - k)) & 1] for k in range(8)) for b in range(256)]
+    return [high + low for high in byte_patterns for low in byte_patterns]
+
+
+def render_parity(bits):
+    """
+    判定結果を "even\\n" / "odd\\n" の並びのバイト列にする関数
+
+    np.packbits で16個分ずつを1つの値にまとめ、事前に作った表のバイト列を連結する。
+    1つずつ print() したり文字列を作ったりしない。
+
+    Args:
+        bits: parity の結果（偶数なら 0、奇数なら 1）
+
+    Returns:
+        bytes: 出力するバイト列
+    """
+    bits = np.asarray(bits, dtype=np.uint8)
+    full = len(bits) // 16 * 16
+    groups = np.packbits(bits[:full]).view(">u2")
+    table = _pattern_table()
+    rendered = b"".join(map(table.__getitem__, groups.tolist()))
+    # 16個に満たない残りは1つずつ
+    return rendered + b"".join(_WORDS[bit] for bit in bits[full:].tolist())
+
+
+def _chunks(values, chunk_size):
+    """整数の列を chunk_size 個ずつに分ける（配列はスライス、イテラブルは islice）"""
+    if isinstance(values, array):
+        values = np.frombuffer(values, dtype=values.typecode)
+    if isinstance(values, np.ndarray):
+        for start in range(0, len(values), chunk_size):
+            yield values[start:start + chunk_size]
+        return
+    iterator = iter(values)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def write_parity(values, out=None, chunk_size=CHUNK_SIZE):
+    """
+    整数の列を偶数・奇数判定して、チャンクごとに1回の write で書き出す関数
+
+    Args:
+        values: 整数の NumPy 配列、array.array、またはイテラブル
+        out: 書き出し先のバイナリストリーム（省略すると標準出力）
+        chunk_size: 1回の write でまとめて書き出す整数の個数
+    """
+    if out is None:
+        sys.stdout.flush()
+        out = sys.stdout.buffer
+    for chunk in _chunks(values, chunk_size):
+        out.write(render_parity(parity(chunk)))
+    out.flush()
+
+
+def _last_digit_parity(buf, offset=0):
+    """
+    空白で区切られた整数のテキストから、各整数の最後の桁の偶奇を取り出す
+
+    ASCII の '0'〜'9' は 48〜57 なので、最後の桁の文字コードの偶奇がそのまま整数の偶奇になる。
+    各整数は符号（'+' か '-'）を1つ付けてもよい数字の並びで、それ以外の文字を含むものは受け付けない
+    （"3.0" や "12abc" の数字の部分だけを判定すると、出力の数が入力の行数とずれるため）。
+
+    Args:
+        buf: テキストの np.uint8 配列（先頭は整数の始まり、末尾は空白）
+        offset: buf の先頭の、ストリーム全体でのバイト位置（エラーメッセージ用）
+
+    Returns:
+        np.ndarray: 偶数なら 0、奇数なら 1 の np.uint8 配列
+
+    Raises:
+        ValueError: 整数ではない文字の並びがある場合
+    """
+    is_digit = (buf - ord("0")) < 10
+    # 数字以外の文字は少ないので、その位置だけを表で分類する
+    marks = np.flatnonzero(~is_digit)
+    kind = _BYTE_CLASS[buf[marks]]
+    bad = None
+    if len(kind) and kind.max() == _OTHER:
+        bad = int(marks[np.argmax(kind == _OTHER)])
+    else:
+        # 符号は、整数の先頭（直前が空白か buf の先頭）にあって、直後が数字のときだけ認める
+        signs = marks[kind == _SIGN]
+        if len(signs):
+            before = (_BYTE_CLASS[buf[signs - 1]] != _SPACE) & (signs > 0)
+            misplaced = np.flatnonzero(~is_digit[signs + 1] | before)
+            if len(misplaced):
+                bad = int(signs[misplaced[0]])
+    if bad is not None:
+        is_space = _BYTE_CLASS[buf] == _SPACE
+        start = bad - int(np.argmax(is_space[bad::-1])) + 1 if is_space[:bad].any() else 0
+        end = bad + int(np.argmax(is_space[bad:]))
+        token = bytes(buf[start:end]).decode("utf-8", "replace")
+        raise ValueError(f"整数ではありません: {token!r}（バイト位置 {offset + start}）")
+    # 整数は数字で終わるので、直前が数字の空白の1つ手前が最後の桁
+    spaces = marks[kind == _SPACE]
+    ends = spaces[is_digit[spaces - 1]] - 1
+    return buf[ends] & 1
+
+
+def parity_from_stream(stream, read_size=READ_SIZE):
+    """
+    バイナリストリームから整数のテキストを読み込み、チャンクごとに偶数・奇数判定するジェネレータ
+
+    整数を int に変換せず、最後の桁の文字だけを NumPy でまとめて調べる。
+    チャンクの境界で切れた整数は、次のチャンクにつなげてから判定する。
+    整数ではない文字の並びがあると ValueError になる（_last_digit_parity）。
+
+    Args:
+        stream: 空白・改行区切りの整数が書かれたバイナリストリーム（ファイルや sys.stdin.buffer）
+        read_size: 一度に読み込むバイト数
+
+    Yields:
+        np.ndarray: 偶数なら 0、奇数なら 1 の np.uint8 配列
+    """
+    rest = b""
+    offset = 0
+    while True:
+        data = stream.read(read_size)
+        if not data:
+            break
+        if rest:
+            data = rest + data
+        # 最後の空白より後ろは、次のチャンクに続いているかもしれないので残す
+        cut = max(data.rfind(space) for space in _SPACES) + 1
+        if cut == 0:
+            rest = data
+            continue
+        rest = data[cut:]
+        yield _last_digit_parity(np.frombuffer(data, dtype=np.uint8, count=cut), offset)
+        offset += cut
+    if rest:
+        yield _last_digit_parity(np.frombuffer(rest + b"\n", dtype=np.uint8), offset)
+
+
+def tag_parity_stream(stream, out=None, read_size=READ_SIZE):
+    """
+    バイナリストリームの整数を偶数・奇数判定して書き出す関数
+
+    Args:
+        stream: 空白・改行区切りの整数が書かれたバイナリストリーム
+        out: 書き出し先のバイナリストリーム（省略すると標準出力）
+        read_size: 一度に読み込むバイト数
+    """
+    if out is None:
+        sys.stdout.flush()
+        out = sys.stdout.buffer
+    for bits in parity_from_stream(stream, read_size):
+        out.write(render_parity(bits))
+    out.flush()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        try:
+            if sys.argv[1] == "-":
+                tag_parity_stream(sys.stdin.buffer)
+            else:
+                with open(sys.argv[1], "rb") as f:
+                    tag_parity_stream(f)
+        except ValueError as e:
+            sys.exit(f"{sys.argv[0]}: {e}")
+        sys.exit()
+
+    for i in range(1,101):
+        if i %2 == 0:
+            print("even")
+        else:
+            print("odd")
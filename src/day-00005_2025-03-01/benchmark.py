@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+"""
+素数・パリンドローム・最小公倍数・FizzBuzz・偶数奇数判定の実装をまとめて計測するベンチマーク
+
+各実装を入力サイズを変えながら繰り返し実行し、以下を記録します：
+- 1回あたりの実行時間の中央値・95パーセンタイル（time.perf_counter_ns で計測）
+- 実行中のピークメモリ（tracemalloc で計測）
+
+結果は JSON で保存でき、保存済みの結果（ベースライン）と比較して遅くなった実装を検出できます。
+
+実行例:
+    python benchmark.py run -o result.json
+    python benchmark.py run --group primes --baseline baseline.json
+    python benchmark.py compare baseline.json result.json --threshold 0.1
+"""
+
+import argparse
+import collections
+import importlib.util
+import io
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+import prime_numbers
+
+SRC_DIR = Path(__file__).resolve().parent.parent
+
+# 1回の計測でこの時間以上になるように呼び出し回数を決める（タイマーの誤差を抑えるため）
+MIN_BATCH_NS = 1_000_000
+
+# ベンチマークの定義
+# group: 分類、name: 実装名、func: 計測する関数、sizes: 入力サイズ、make_args: サイズから引数を作る関数
+Benchmark = collections.namedtuple("Benchmark", ["group", "name", "func", "sizes", "make_args"])
+
+
+def load_module(name, relative_path):
+    """
+    src 以下のファイルをモジュールとして読み込む（ディレクトリ名にハイフンがあり import できないため）
+
+    Args:
+        name: モジュール名
+        relative_path: src からの相対パス
+
+    Returns:
+        module: 読み込んだモジュール
+    """
+    spec = importlib.util.spec_from_file_location(name, SRC_DIR / relative_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _largest_prime_below(n):
+    """n 以下の最大の素数を返す（素数判定の入力用）"""
+    while not prime_numbers.is_prime_fast(n):
+        n -= 1
+    return n
+
+
+def _palindrome_text(size):
+    """長さ size のパリンドロームの文を作る"""
+    half = ("A man, a plan, a canal, " * (size // 48 + 1))[:size // 2]
+    return half + half[::-1]
+
+
+def _short_strings(count):
+    """製品コードのような短い文字列を count 個作る（3割がパリンドローム）"""
+    rng = random.Random(count)
+    strings = []
+    for _ in range(count):
+        head = "".join(rng.choice("ABC12xy-") for _ in range(rng.randrange(2, 7)))
+        strings.append(head + head[::-1] if rng.random() < 0.3 else head + "Q" + head)
+    return strings
+
+
+def _noisy_text(size):
+    """OCR の誤りを模して、周期的な文に0.1%の確率で誤りを混ぜた文字列を作る"""
+    rng = random.Random(size)
+    chars = list(("abcba" * (size // 5 + 1))[:size])
+    for i in range(size):
+        if rng.random() < 0.001:
+            chars[i] = rng.choice("xyz")
+    return "".join(chars)
+
+
+def _range_queries(count, text_size=10**5, max_length=1000):
+    """長さ text_size の文（正規化しても変わらない）と、それに対する count 個の範囲を作る"""
+    rng = random.Random(count)
+    starts = [rng.randrange(text_size - max_length) for _ in range(count)]
+    ends = [start + rng.randrange(max_length) for start in starts]
+    return _noisy_text(text_size), starts, ends
+
+
+def _large_ints(count):
+    """64ビットのランダムな整数を count 個作る（最小公倍数の入力用）"""
+    rng = random.Random(count)
+    return [rng.getrandbits(64) | 1 for _ in range(count)]
+
+
+def _job_periods(count):
+    """ジョブの実行周期（秒）のような値を count 個作る"""
+    rng = random.Random(count)
+    return [rng.choice([5, 10, 15, 30, 60, 120, 300, 600, 900, 3600, 86400]) * rng.randrange(1, 4)
+            for _ in range(count)]
+
+
+def _period_set_changes(period_set, periods):
+    """周期を100回入れ替えて、そのたびに最小公倍数を読む"""
+    for period in periods[:100]:
+        period_set.remove(period)
+        period_set.add(period * 7)
+        period_set.lcm
+        period_set.remove(period * 7)
+        period_set.add(period)
+    return period_set.lcm
+
+
+def _recompute_changes(lcm_of_multiple_numbers, periods):
+    """_period_set_changes と同じ入れ替えを、毎回リスト全体から計算し直す（比較用）"""
+    periods = list(periods)
+    for i in range(100):
+        period = periods[i]
+        periods[i] = period * 7
+        lcm_of_multiple_numbers(periods)
+        periods[i] = period
+    return lcm_of_multiple_numbers(periods)
+
+
+def _lcm_fold(numbers):
+    """左から1つずつ掛けてから割る最小公倍数（比較用）"""
+    result = numbers[0]
+    for num in numbers[1:]:
+        result = result * num // math.gcd(result, num)
+    return result
+
+
+class _NullWriter:
+    """書き出したバイト数だけを数える出力先（出力の速さだけを計測するため）"""
+
+    def __init__(self):
+        self.size = 0
+
+    def write(self, data):
+        self.size += len(data)
+
+    def flush(self):
+        pass
+
+
+def _print_parity(values):
+    """1つずつ print() で偶数・奇数を書き出す（比較用）"""
+    out = _NullWriter()
+    for value in values:
+        print("even" if value % 2 == 0 else "odd", file=out)
+
+
+def _id_text(count):
+    """1行1整数の ID のテキストを count 行作る"""
+    rng = random.Random(count)
+    return b"".join(b"%d\n" % rng.getrandbits(40) for _ in range(count))
+
+
+def default_benchmarks():
+    """
+    計測対象のベンチマークの一覧を作る
+
+    Returns:
+        list: Benchmark のリスト
+    """
+    palindrome = load_module("palindrome", "day-00006_2025-03-02/palindrome.py")
+    fizzbuzz = load_module("fizzbuzz", "day-00003_2025-02-27/fizzbuzz.py")
+    even_odd = load_module("even_odd", "day-00004_2025-02-28/even_odd.py")
+
+    prime_sizes = [10**4, 10**6, 10**9, 10**12]
+    sieve_sizes = [10**3, 10**5, 10**6]
+    primality = lambda size: (_largest_prime_below(size),)
+    limit = lambda size: (size,)
+
+    return [
+        # 素数判定
+        Benchmark("primes", "is_prime_trial_division", prime_numbers.is_prime_trial_division,
+                  prime_sizes[:3], primality),
+        Benchmark("primes", "miller_rabin", prime_numbers.miller_rabin, prime_sizes, primality),
+        Benchmark("primes", "miller_rabin_deterministic",
+                  lambda n: prime_numbers.miller_rabin(n, deterministic=True), prime_sizes, primality),
+        Benchmark("primes", "is_prime_fast", prime_numbers.is_prime_fast, prime_sizes, primality),
+        # 素数の列挙・計数
+        Benchmark("primes", "sieve_of_eratosthenes", prime_numbers.sieve_of_eratosthenes,
+                  sieve_sizes, limit),
+        Benchmark("primes", "list_primes_optimized", prime_numbers.list_primes_optimized,
+                  sieve_sizes, limit),
+        Benchmark("primes", "segmented_sieve", lambda n: list(prime_numbers.segmented_sieve(0, n + 1)),
+                  sieve_sizes, limit),
+        Benchmark("primes", "sieve_bitpacked", prime_numbers.sieve_bitpacked, sieve_sizes, limit),
+        Benchmark("primes", "prime_pi", prime_numbers.prime_pi, sieve_sizes + [10**9], limit),
+        # 素因数分解
+        Benchmark("primes", "factorize", prime_numbers.factorize, [10**6, 10**12, 10**18],
+                  lambda size: (size - 1,)),
+        # パリンドローム判定
+        Benchmark("palindrome", "is_palindrome_simple", palindrome.is_palindrome_simple,
+                  [10**2, 10**4, 10**6], lambda size: (_palindrome_text(size),)),
+        Benchmark("palindrome", "is_palindrome_two_pointer", palindrome.is_palindrome_two_pointer,
+                  [10**2, 10**4, 10**6], lambda size: (_palindrome_text(size),)),
+        Benchmark("palindrome", "is_palindrome_iterative", palindrome.is_palindrome_iterative,
+                  [10**2, 10**4, 10**6], lambda size: (_palindrome_text(size),)),
+        Benchmark("palindrome", "is_palindrome_buffer", palindrome.is_palindrome_buffer,
+                  [10**2, 10**4, 10**6], lambda size: (_palindrome_text(size).encode("utf-8"),)),
+        # 大量の短い文字列の判定（1つずつ判定するループと一括判定を比べる）
+        Benchmark("palindrome", "is_palindrome_simple_loop",
+                  lambda strings: [palindrome.is_palindrome_simple(s) for s in strings],
+                  [10**3, 10**5], lambda size: (_short_strings(size),)),
+        Benchmark("palindrome", "classify_palindromes", palindrome.classify_palindromes,
+                  [10**3, 10**5], lambda size: (_short_strings(size),)),
+        # 不一致を許す最長パリンドローム（1文字ずつ広げる方法とハッシュで飛ばす方法を比べる）
+        Benchmark("palindrome", "longest_palindrome_within_naive",
+                  lambda text: palindrome._longest_palindrome_within_naive(text, 3),
+                  [10**2, 10**3, 10**4], lambda size: (_noisy_text(size),)),
+        Benchmark("palindrome", "longest_palindrome_within",
+                  lambda text: palindrome.longest_palindrome_within(text, 3),
+                  [10**2, 10**3, 10**4], lambda size: (_noisy_text(size),)),
+        # 同じ文に対する範囲の判定（毎回スライスして反転する方法と索引を使う方法を比べる）
+        Benchmark("palindrome", "range_slice_loop",
+                  lambda text, starts, ends: [text[i:j] == text[i:j][::-1] for i, j in zip(starts, ends)],
+                  [10**3, 10**5], lambda size: _range_queries(size)),
+        Benchmark("palindrome", "PalindromeIndex.is_palindrome_many",
+                  lambda index, starts, ends: index.is_palindrome_many(starts, ends),
+                  [10**3, 10**5], lambda size: (palindrome.PalindromeIndex(_range_queries(size)[0]),
+                                                *_range_queries(size)[1:])),
+        # 再帰版は再帰の深さの上限があるため短い入力だけ計測する
+        Benchmark("palindrome", "is_palindrome_recursive", palindrome.is_palindrome_recursive,
+                  [10**2, 10**3], lambda size: (_palindrome_text(size),)),
+        # 最小公倍数
+        Benchmark("lcm", "lcm_of_multiple_numbers", fizzbuzz.lcm_of_multiple_numbers,
+                  [10, 10**3, 10**4], lambda size: (list(range(1, size + 1)),)),
+        # 大きな整数（左から畳み込む方法と2つずつ組にする方法を比べる）
+        Benchmark("lcm", "lcm_fold_large_ints", _lcm_fold, [10**2, 10**3], lambda size: (_large_ints(size),)),
+        Benchmark("lcm", "lcm_of_multiple_numbers_large_ints", fizzbuzz.lcm_of_multiple_numbers,
+                  [10**2, 10**3], lambda size: (_large_ints(size),)),
+        # 周期の集合を少しずつ変えながら最小公倍数を読む（毎回計算し直す方法と PeriodSet を比べる）
+        Benchmark("lcm", "lcm_recompute_per_change",
+                  lambda periods: _recompute_changes(fizzbuzz.lcm_of_multiple_numbers, periods), [10**2, 10**4],
+                  lambda size: (_job_periods(size),)),
+        Benchmark("lcm", "PeriodSet_per_change", _period_set_changes, [10**2, 10**4],
+                  lambda size: (fizzbuzz.PeriodSet(_job_periods(size)), _job_periods(size))),
+        # int64 に収まる NumPy 配列（np.lcm で計算する）
+        Benchmark("lcm", "lcm_of_multiple_numbers_array", fizzbuzz.lcm_of_multiple_numbers,
+                  [10**3, 10**6], lambda size: (np.random.default_rng(size).integers(1, 13, size),)),
+        # FizzBuzz の出力（1行ずつ作る方法とブロック単位で書き出す方法を比べる）
+        Benchmark("fizzbuzz", "fizzbuzz_label_loop",
+                  lambda n: _NullWriter().write("".join(fizzbuzz.fizzbuzz_label(i) + "\n"
+                                                         for i in range(1, n + 1)).encode()),
+                  [10**3, 10**5], limit),
+        Benchmark("fizzbuzz", "write_fizzbuzz", lambda n: fizzbuzz.write_fizzbuzz(n, out=_NullWriter()),
+                  [10**3, 10**5, 10**7], limit),
+        Benchmark("fizzbuzz", "write_fizzbuzz_parallel",
+                  lambda n: fizzbuzz.write_fizzbuzz_parallel(n, out=_NullWriter()), [10**7, 10**8], limit),
+        # 偶数・奇数のタグ付け
+        Benchmark("even_odd", "print_parity_loop", _print_parity, [10**3, 10**5], lambda size: (range(size),)),
+        Benchmark("even_odd", "write_parity_array", lambda values: even_odd.write_parity(values, out=_NullWriter()),
+                  [10**3, 10**5, 10**7], lambda size: (np.arange(size, dtype=np.int64),)),
+        Benchmark("even_odd", "tag_parity_stream",
+                  lambda data: even_odd.tag_parity_stream(io.BytesIO(data), out=_NullWriter()),
+                  [10**3, 10**5, 10**6], lambda size: (_id_text(size),)),
+    ]
+
+
+def _percentile(sorted_values, q):
+    """ソート済みの値から最近傍順位法でパーセンタイルを求める"""
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def measure(func, args, repeat=5, warmup=1):
+    """
+    関数の実行時間とピークメモリを計測する
+
+    ウォームアップの後、1回の計測が MIN_BATCH_NS 以上になるように呼び出し回数を調整し、
+    repeat 回計測する。ピークメモリは実行時間を乱さないよう別に1回だけ計測する。
+
+    Args:
+        func: 計測する関数
+        args: 関数に渡す引数のタプル
+        repeat: 計測回数
+        warmup: ウォームアップの回数
+
+    Returns:
+        dict: 1回あたりの実行時間（ナノ秒）の統計とピークメモリ（バイト）
+    """
+    for _ in range(warmup):
+        func(*args)
+
+    # 呼び出し回数を倍々にして、1回の計測時間が十分長くなる回数を探す
+    number = 1
+    while True:
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            func(*args)
+        elapsed = time.perf_counter_ns() - start
+        if elapsed >= MIN_BATCH_NS:
+            break
+        number *= 2
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            func(*args)
+        timings.append((time.perf_counter_ns() - start) / number)
+    timings.sort()
+
+    tracemalloc.start()
+    try:
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "number": number,
+        "repeat": repeat,
+        "median_ns": _percentile(timings, 50),
+        "p95_ns": _percentile(timings, 95),
+        "min_ns": timings[0],
+        "peak_bytes": peak,
+    }
+
+
+def run_benchmarks(groups=None, repeat=5, warmup=1, benchmarks=None):
+    """
+    ベンチマークをすべてのサイズについて実行する
+
+    Args:
+        groups: 実行するグループ名のリスト。None ならすべて
+        repeat: 計測回数
+        warmup: ウォームアップの回数
+        benchmarks: Benchmark のリスト。None なら default_benchmarks() を使う
+
+    Returns:
+        dict: 実行環境の情報と計測結果をまとめた JSON 互換の辞書
+    """
+    if benchmarks is None:
+        benchmarks = default_benchmarks()
+    results = []
+    for bench in benchmarks:
+        if groups and bench.group not in groups:
+            continue
+        for size in bench.sizes:
+            args = bench.make_args(size)
+            stats = measure(bench.func, args, repeat=repeat, warmup=warmup)
+            results.append({"group": bench.group, "name": bench.name, "size": size, **stats})
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def compare_results(baseline, current, threshold=0.1):
+    """
+    ベースラインと今回の結果を比較し、中央値が threshold 以上遅くなったものを探す
+
+    Args:
+        baseline: ベースラインの結果（run_benchmarks の戻り値と同じ形式）
+        current: 今回の結果
+        threshold: 遅くなったとみなす割合（0.1 なら10%）
+
+    Returns:
+        list: 比較結果の辞書のリスト（ベースラインにない項目は含まない）
+    """
+    base = {(r["group"], r["name"], r["size"]): r for r in baseline["results"]}
+    rows = []
+    for r in current["results"]:
+        key = (r["group"], r["name"], r["size"])
+        if key not in base:
+            continue
+        ratio = r["median_ns"] / base[key]["median_ns"]
+        rows.append({
+            "group": r["group"],
+            "name": r["name"],
+            "size": r["size"],
+            "baseline_ns": base[key]["median_ns"],
+            "median_ns": r["median_ns"],
+            "ratio": ratio,
+            "slower": ratio > 1 + threshold,
+        })
+    return rows
+
+
+def _format_ns(ns):
+    """ナノ秒を読みやすい単位の文字列にする"""
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.3f}{unit}"
+    return f"{ns:.0f}ns"
+
+
+def format_results(report):
+    """
+    計測結果を表形式の文字列にする
+
+    Args:
+        report: run_benchmarks の戻り値
+
+    Returns:
+        str: 表形式の文字列
+    """
+    lines = [f"{'group':<11} {'name':<34} {'size':>20} {'median':>11} {'p95':>11} {'peak':>12}"]
+    for r in report["results"]:
+        lines.append(f"{r['group']:<11} {r['name']:<34} {r['size']:>20} "
+                     f"{_format_ns(r['median_ns']):>11} {_format_ns(r['p95_ns']):>11} "
+                     f"{r['peak_bytes']:>11}B")
+    return "\n".join(lines)
+
+
+def format_comparison(rows):
+    """
+    比較結果を表形式の文字列にする
+
+    Args:
+        rows: compare_results の戻り値
+
+    Returns:
+        str: 表形式の文字列（遅くなったものには印を付ける）
+    """
+    lines = [f"{'group':<11} {'name':<34} {'size':>20} {'baseline':>11} {'current':>11} {'ratio':>7}"]
+    for r in rows:
+        mark = "  <- 遅くなりました" if r["slower"] else ""
+        lines.append(f"{r['group']:<11} {r['name']:<34} {r['size']:>20} "
+                     f"{_format_ns(r['baseline_ns']):>11} {_format_ns(r['median_ns']):>11} "
+                     f"{r['ratio']:>6.2f}x{mark}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """
+    コマンドラインから実行する
+
+    Returns:
+        int: 終了コード（遅くなった実装があれば1）
+    """
+    parser = argparse.ArgumentParser(description="素数・パリンドローム・最小公倍数の実装のベンチマーク")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="ベンチマークを実行する")
+    run.add_argument("--group", action="append", choices=["primes", "palindrome", "lcm", "fizzbuzz", "even_odd"],
+                     help="実行するグループ（複数指定可、省略時はすべて）")
+    run.add_argument("--repeat", type=int, default=5, help="計測回数")
+    run.add_argument("--warmup", type=int, default=1, help="ウォームアップの回数")
+    run.add_argument("-o", "--output", help="結果を保存する JSON ファイル")
+    run.add_argument("--baseline", help="比較するベースラインの JSON ファイル")
+    run.add_argument("--threshold", type=float, default=0.1, help="遅くなったとみなす割合")
+
+    compare = sub.add_parser("compare", help="保存済みの結果を比較する")
+    compare.add_argument("baseline", help="ベースラインの JSON ファイル")
+    compare.add_argument("current", help="比較する JSON ファイル")
+    compare.add_argument("--threshold", type=float, default=0.1, help="遅くなったとみなす割合")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        report = run_benchmarks(groups=args.group, repeat=args.repeat, warmup=args.warmup)
+        print(format_results(report))
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+        if not args.baseline:
+            return 0
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        current = report
+    else:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        with open(args.current, encoding="utf-8") as f:
+            current = json.load(f)
+
+    rows = compare_results(baseline, current, threshold=args.threshold)
+    print(format_comparison(rows))
+    return 1 if any(r["slower"] for r in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
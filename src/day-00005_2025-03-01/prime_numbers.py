@@ -7,13 +7,35 @@
 2. エラトステネスの篩 - 範囲内の素数を効率的に列挙
 3. ミラー・ラビン素数判定法 - 確率的素数判定
 4. 最適化された素数列挙 - メモリ効率を考慮した実装
+5. 区間篩（セグメント篩） - 巨大な範囲の素数をメモリ一定で列挙
+6. ビット詰め篩 - 奇数1個を1ビットで表し、NumPyでまとめて除外
+7. 並列区間篩 - 範囲を分割して複数プロセスで素数を数える・列挙する
+8. 高速素数判定 - 小さな素数での事前ふるい + 決定的ミラー・ラビン法（一括判定対応）
+9. 素数表キャッシュ - 篩のビット列をファイルに保存して mmap で再利用
+10. 素数計数関数 π(x) - Lucy_Hedgehog 法で篩を使わずに素数の個数を求める
+11. 素因数分解 - 最小素因数表 + 車輪法の試し割り + ポラード・ロー法（Brent の改良版）
 
 実行例: python prime_numbers.py
+
+コマンドラインからの一括処理（標準入力またはファイルから1行1整数で読み込む）:
+    python prime_numbers.py is-prime numbers.txt --algorithm fast
+    python prime_numbers.py list 1000000000 1000100000
+    python prime_numbers.py count 0 1000000000000
+    cat numbers.txt | python prime_numbers.py factor
 """
 
+import argparse
+import collections
 import math
+import mmap
+import os
 import random
+import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress, islice
+
+import numpy as np
 
 
 # ==== 1. 試し割り法（基本的な方法） ====
@@ -77,13 +99,156 @@ def sieve_of_eratosthenes(n):
 
 
 # ==== 3. ミラー・ラビン素数判定法 ====
-def miller_rabin(n, k=5):
+# 決定的に判定できる底の組（n がしきい値未満なら、この底だけで素数判定が確定する）
+_MR_WITNESSES = [
+    (2_047, (2,)),
+    (1_373_653, (2, 3)),
+    (9_080_191, (31, 73)),
+    (25_326_001, (2, 3, 5)),
+    (3_215_031_751, (2, 3, 5, 7)),
+    (4_759_123_141, (2, 7, 61)),
+    (1_122_004_669_633, (2, 13, 23, 1662803)),
+    (2_152_302_898_747, (2, 3, 5, 7, 11)),
+    (3_474_749_660_383, (2, 3, 5, 7, 11, 13)),
+    (341_550_071_728_321, (2, 3, 5, 7, 11, 13, 17)),
+    (3_825_123_056_546_413_051, (2, 3, 5, 7, 11, 13, 17, 19, 23)),
+    (318_665_857_834_031_151_167_461, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)),
+    (3_317_044_064_679_887_385_961_981, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)),
+]
+
+
+def _deterministic_witnesses(n):
+    """
+    n の大きさに応じた最小の底の組を返す
+
+    3.3*10^24 以上の n では決定的な底の組が知られていないため、最大の組を返す。
+    この組だけでは判定が確定しない（3317044064679887385961981 はすべての底で強擬素数になる）ので、
+    miller_rabin では強いリュカ判定（_is_strong_lucas_probable_prime）を組み合わせる。
+
+    Args:
+        n: 判定する奇数
+
+    Returns:
+        tuple: ミラー・ラビン法に使う底
+    """
+    for limit, bases in _MR_WITNESSES:
+        if n < limit:
+            return bases
+    return _MR_WITNESSES[-1][1]
+
+
+def _is_strong_probable_prime(n, a, d, r):
+    """
+    底 a について n が強擬素数（素数の可能性がある）かを調べる
+
+    Args:
+        n: 判定する奇数
+        a: 底
+        d, r: n-1 = 2^r * d を満たす値（d は奇数）
+
+    Returns:
+        bool: 合成数と判定できなければTrue
+    """
+    a %= n
+    if a == 0:
+        return True
+    x = pow(a, d, n)  # (a^d) % n を効率的に計算
+
+    if x == 1 or x == n - 1:
+        return True
+
+    for _ in range(r - 1):
+        x = x * x % n
+        if x == n - 1:
+            return True
+    return False  # 合成数と判定
+
+
+def _jacobi(a, n):
+    """
+    ヤコビ記号 (a/n) を求める
+
+    Args:
+        a: 整数
+        n: 正の奇数
+
+    Returns:
+        int: 1, -1, 0 のいずれか
+    """
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+
+def _is_strong_lucas_probable_prime(n):
+    """
+    強いリュカ確率的素数判定（Selfridge の方法でパラメータを選ぶ）
+
+    D = 5, -7, 9, -11, ... のうち (D/n) = -1 となる最初のものを選び、P = 1, Q = (1-D)/4 の
+    リュカ数列 U, V を n+1 = 2^s * d の d まで2進法で求めて調べる。
+    底2の強擬素数判定と組み合わせたもの（BPSW 判定）には、反例が知られていない。
+
+    Args:
+        n: 判定する奇数（5以上）
+
+    Returns:
+        bool: 合成数と判定できなければTrue
+    """
+    # 平方数では (D/n) = -1 となる D が見つからないので、先に除く
+    if math.isqrt(n) ** 2 == n:
+        return False
+    D = 5
+    while True:
+        j = _jacobi(D, n)
+        if j == -1:
+            break
+        if j == 0 and abs(D) != n:
+            return False
+        D = -D - 2 if D > 0 else -D + 2
+    Q = (1 - D) // 4
+
+    def half(x):
+        # n を法として2で割る（n は奇数なので、奇数なら n を足してから割る）
+        return (x + n if x % 2 else x) // 2 % n
+
+    s, d = 0, n + 1
+    while d % 2 == 0:
+        s += 1
+        d //= 2
+    # U_1 = 1, V_1 = P = 1 から始め、d の上位ビットから2倍（と1の加算）をくり返す
+    U, V, Qk = 1, 1, Q % n
+    for bit in bin(d)[3:]:
+        U, V, Qk = U * V % n, (V * V - 2 * Qk) % n, Qk * Qk % n
+        if bit == "1":
+            U, V, Qk = half(U + V), half(D * U + V), Qk * Q % n
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V, Qk = (V * V - 2 * Qk) % n, Qk * Qk % n
+        if V == 0:
+            return True
+    return False
+
+
+def miller_rabin(n, k=5, deterministic=False):
     """
     ミラー・ラビン素数判定法
     
     Args:
         n: 判定する数
         k: テスト回数（大きいほど精度が上がる）
+        deterministic: Trueなら乱数の代わりに n の大きさに応じた決まった底を使う。
+            n < 3.3*10^24 では判定結果が確定し、k は無視される。
+            それ以上では強いリュカ判定も行う（BPSW 判定。反例は知られていない）
     
     Returns:
         bool: 素数である確率が高いならTrue
@@ -101,21 +266,20 @@ def miller_rabin(n, k=5):
         r += 1
         d //= 2
     
-    # k回のテストを実行
-    for _ in range(k):
-        a = random.randint(2, n - 2) if n > 3 else 2
-        x = pow(a, d, n)  # (a^d) % n を効率的に計算
-        
-        if x == 1 or x == n - 1:
-            continue
-        
-        for _ in range(r - 1):
-            x = pow(x, 2, n)
-            if x == n - 1:
-                break
-        else:
+    if deterministic:
+        bases = _deterministic_witnesses(n)
+    else:
+        # k回のテストを実行
+        bases = (random.randint(2, n - 2) for _ in range(k))
+
+    for a in bases:
+        if not _is_strong_probable_prime(n, a, d, r):
             return False  # 合成数と判定
-    
+
+    # 決定的な底の組が知られていない大きさでは、強いリュカ判定を組み合わせる
+    if deterministic and n >= _MR_WITNESSES[-1][0]:
+        return _is_strong_lucas_probable_prime(n)
+
     return True  # おそらく素数
 
 
@@ -163,66 +327,1156 @@ def list_primes_optimized(n):
     return primes
 
 
+# ==== 5. 区間篩（セグメント篩） ====
+# 1セグメントあたりに扱う奇数の個数（L2キャッシュに収まる程度の大きさ）
+SEGMENT_SIZE = 1 << 18
+
+
+def _base_primes(hi):
+    """
+    区間 [lo, hi) をふるうのに必要な奇素数（√(hi-1) 以下）を返す
+
+    Args:
+        hi: 区間の上限（この値を含まない）
+
+    Returns:
+        list: √(hi-1) 以下の奇素数のリスト
+    """
+    if hi <= 4:
+        return []
+    # 既存の奇数のみの篩を再利用する（2は別扱いなので除く）
+    return list_primes_optimized(math.isqrt(hi - 1))[1:]
+
+
+def _sieve_odd_segment(lo, hi, base_primes):
+    """
+    区間 [lo, hi) に含まれる奇数だけをふるう
+
+    Args:
+        lo: 区間の下限（この値を含む）
+        hi: 区間の上限（この値を含まない）
+        base_primes: √(hi-1) 以下の奇素数のリスト
+
+    Returns:
+        tuple: (first, seg)
+            first: 区間内で最初の奇数
+            seg: seg[k] が1なら first + 2*k が素数であることを表す bytearray
+    """
+    first = lo | 1
+    size = (hi - first + 1) // 2 if hi > first else 0
+    seg = bytearray(b"\x01") * size
+    # スライス代入用のゼロ列（memoryviewで切り出すのでコピーは発生しない）
+    zeros = memoryview(bytes(size))
+    for p in base_primes:
+        pp = p * p
+        if pp >= hi:
+            break
+        # 区間内で最初に現れる p の奇数倍（ただし p*p 未満は他の素数で除外済み）
+        m = max(pp, (first + p - 1) // p * p)
+        if m % 2 == 0:
+            m += p
+        start = (m - first) // 2
+        if start < size:
+            # 奇数だけを並べているので、p の奇数倍はインデックス上で p 刻みになる
+            seg[start::p] = zeros[:(size - 1 - start) // p + 1]
+    # 1は素数ではない
+    if first == 1 and size:
+        seg[0] = 0
+    return first, seg
+
+
+def segmented_sieve(lo, hi, segment_size=SEGMENT_SIZE):
+    """
+    区間篩で [lo, hi) の素数を小さい順に1つずつ返すジェネレータ
+
+    範囲全体ではなく segment_size 個の奇数ごとに区切ってふるうため、
+    使用メモリは hi の大きさによらずセグメントの大きさ（と √hi 以下の素数表）で抑えられる。
+
+    Args:
+        lo: 区間の下限（この値を含む）
+        hi: 区間の上限（この値を含まない）
+        segment_size: 1セグメントあたりの奇数の個数
+
+    Yields:
+        int: 区間内の素数
+    """
+    lo = max(lo, 2)
+    if lo >= hi:
+        return
+    base_primes = _base_primes(hi)
+    if lo == 2:
+        yield 2
+        lo = 3
+    span = 2 * segment_size
+    for seg_lo in range(lo, hi, span):
+        seg_hi = min(seg_lo + span, hi)
+        first, seg = _sieve_odd_segment(seg_lo, seg_hi, base_primes)
+        yield from compress(range(first, first + 2 * len(seg), 2), seg)
+
+
+# ==== 6. ビット詰め篩（NumPy版） ====
+# ビット列から素数を取り出すときに一度に展開するバイト数
+_UNPACK_CHUNK = 1 << 16
+
+
+def _mark_odd_bits(bits, first_index, nbits, base_primes):
+    """
+    奇数のビット列から base_primes の倍数のビットを落とす
+
+    ビット i（バイト i//8 の下位から i%8 番目）が奇数 2*(first_index + i) + 3 に対応する。
+    p の奇数倍はビット上で p 刻みに並ぶので、8個おきに見るとバイト上では p 刻みで
+    同じ位置のビットになる。そのため1つの素数につき8回のストライド演算で除外できる。
+
+    Args:
+        bits: np.uint8 のビット列（この関数で書き換える）
+        first_index: 先頭ビットに対応する奇数のインデックス（8の倍数）
+        nbits: 有効なビット数
+        base_primes: ふるいに使う奇素数のリスト
+    """
+    first = 2 * first_index + 3
+    last = 2 * (first_index + nbits) + 1  # 範囲内の最後の奇数
+    for p in base_primes:
+        pp = p * p
+        if pp > last:
+            break
+        m = max(pp, (first + p - 1) // p * p)
+        if m % 2 == 0:
+            m += p
+        start = (m - first) // 2
+        for r in range(8):
+            j = start + r * p
+            if j >= nbits:
+                break
+            bits[j >> 3::p] &= np.uint8(~(1 << (j & 7)) & 0xFF)
+
+
+def _odd_sieve_bits(n):
+    """
+    3 から n までの奇数について、素数なら1となるビット列を作る
+
+    Args:
+        n: この値以下の素数を求める（n >= 3）
+
+    Returns:
+        tuple: (bits, size)
+            bits: 奇数1個を1ビットで表した np.uint8 配列
+            size: 有効なビット数（3, 5, ..., n の奇数の数）
+    """
+    size = (n - 1) // 2
+    bits = np.full((size + 7) // 8, 0xFF, dtype=np.uint8)
+    # 末尾の余ったビットは素数ではないものとして落としておく
+    if size % 8:
+        bits[-1] = (1 << (size % 8)) - 1
+    _mark_odd_bits(bits, 0, size, _base_primes(n + 1))
+    return bits, size
+
+
+def _bits_to_primes(bits, first_index, nbits):
+    """
+    奇数のビット列から素数の NumPy 配列を作る
+
+    一度に展開するのは _UNPACK_CHUNK バイト分だけなので、
+    一時的に必要なメモリはビット列全体の大きさによらない。
+
+    Args:
+        bits: 奇数1個を1ビットで表した np.uint8 配列
+        first_index: 先頭ビットに対応する奇数のインデックス
+        nbits: 有効なビット数
+
+    Returns:
+        np.ndarray: 素数の配列（np.int64）
+    """
+    parts = []
+    for offset in range(0, len(bits), _UNPACK_CHUNK):
+        chunk = bits[offset:offset + _UNPACK_CHUNK]
+        count = min(8 * len(chunk), nbits - 8 * offset)
+        idx = np.flatnonzero(np.unpackbits(chunk, count=count, bitorder="little"))
+        parts.append(2 * (idx + first_index + 8 * offset) + 3)
+    if not parts:
+        return np.empty(0, dtype=np.int64)
+    return np.concatenate(parts).astype(np.int64, copy=False)
+
+
+def sieve_bitpacked(n):
+    """
+    奇数1個を1ビットで表したビット詰めの篩で n 以下の素数を求める
+
+    list_primes_optimized と同じ奇数のみの篩だが、bool のリストの代わりに
+    np.uint8 のビット列を使い、倍数の除外をストライド演算でまとめて行う。
+    結果は Python のリストを作らずに NumPy 配列で返す。
+
+    Args:
+        n: この値以下の素数を求める
+
+    Returns:
+        np.ndarray: n以下の素数の配列（np.int64）
+    """
+    if n < 2:
+        return np.empty(0, dtype=np.int64)
+    if n == 2:
+        return np.array([2], dtype=np.int64)
+    bits, size = _odd_sieve_bits(n)
+    return np.concatenate(([2], _bits_to_primes(bits, 0, size)))
+
+
+def sieve_bitpacked_range(lo, hi, segment_size=SEGMENT_SIZE):
+    """
+    ビット詰めの篩で [lo, hi) の素数をセグメントごとに NumPy 配列で返すジェネレータ
+
+    segmented_sieve と同じく lo から segment_size 個の奇数ごとに区切ってふるうので、
+    使用メモリはセグメントの大きさ（と √hi 以下の素数表）で抑えられ、lo の大きさにもよらない。
+
+    Args:
+        lo: 区間の下限（この値を含む）
+        hi: 区間の上限（この値を含まない）
+        segment_size: 1セグメントあたりの奇数の個数
+
+    Yields:
+        np.ndarray: セグメント内の素数の配列（np.int64）
+    """
+    if lo <= 2 < hi:
+        yield np.array([2], dtype=np.int64)
+    lo = max(lo, 3)
+    if lo >= hi:
+        return
+    base_primes = _base_primes(hi)
+    # ビット i が奇数 2*i + 3 に対応する。先頭はバイト境界にそろえ、lo 未満は後で除く
+    first_index = (lo - 3) // 2 // 8 * 8
+    end_index = (hi - 2) // 2
+    step = max(8, segment_size // 8 * 8)
+    for start in range(first_index, end_index, step):
+        nbits = min(step, end_index - start)
+        bits = np.full((nbits + 7) // 8, 0xFF, dtype=np.uint8)
+        _mark_odd_bits(bits, start, nbits, base_primes)
+        primes = _bits_to_primes(bits, start, nbits)
+        if start == first_index:
+            primes = primes[np.searchsorted(primes, lo):]
+        yield primes
+
+
+# ==== 7. 並列区間篩 ====
+# ワーカープロセスごとに保持する基底素数表（_init_worker で設定される）
+_WORKER_BASE_PRIMES = None
+# iter_primes_in_range の1タスクあたりのセグメント数（1タスクの結果は数MBに収まる）
+STREAM_TASK_SEGMENTS = 16
+
+
+def _init_worker(base_primes):
+    """
+    ワーカープロセスの初期化処理。基底素数表を一度だけ受け取って保持する
+
+    Args:
+        base_primes: √hi 以下の奇素数の配列（np.int64）
+    """
+    global _WORKER_BASE_PRIMES
+    _WORKER_BASE_PRIMES = base_primes.tolist()
+
+
+def _count_primes_task(lo, hi, base_primes=None):
+    """
+    [lo, hi) の奇素数の個数をセグメントごとにふるって数える
+
+    Args:
+        lo: 区間の下限（この値を含む、3以上）
+        hi: 区間の上限（この値を含まない）
+        base_primes: 基底素数表。None ならワーカーが保持しているものを使う
+
+    Returns:
+        int: 区間内の奇素数の個数
+    """
+    if base_primes is None:
+        base_primes = _WORKER_BASE_PRIMES
+    count = 0
+    span = 2 * SEGMENT_SIZE
+    for seg_lo in range(lo, hi, span):
+        _, seg = _sieve_odd_segment(seg_lo, min(seg_lo + span, hi), base_primes)
+        count += seg.count(1)
+    return count
+
+
+def _primes_task(lo, hi, base_primes=None):
+    """
+    [lo, hi) の奇素数をセグメントごとにふるって NumPy 配列で返す
+
+    Args:
+        lo: 区間の下限（この値を含む、3以上）
+        hi: 区間の上限（この値を含まない）
+        base_primes: 基底素数表。None ならワーカーが保持しているものを使う
+
+    Returns:
+        np.ndarray: 区間内の奇素数の配列（np.int64）
+    """
+    if base_primes is None:
+        base_primes = _WORKER_BASE_PRIMES
+    parts = []
+    span = 2 * SEGMENT_SIZE
+    for seg_lo in range(lo, hi, span):
+        first, seg = _sieve_odd_segment(seg_lo, min(seg_lo + span, hi), base_primes)
+        idx = np.flatnonzero(np.frombuffer(seg, dtype=np.uint8))
+        parts.append(first + 2 * idx)
+    if not parts:
+        return np.empty(0, dtype=np.int64)
+    return np.concatenate(parts).astype(np.int64, copy=False)
+
+
+def _run_range_tasks(task, lo, hi, workers):
+    """
+    [lo, hi) の奇数部分をタスクに分割し、ProcessPoolExecutor で並列に処理する
+
+    Args:
+        task: 各区間に適用する関数（_count_primes_task または _primes_task）
+        lo: 区間の下限（この値を含む、3以上）
+        hi: 区間の上限（この値を含まない）
+        workers: ワーカープロセス数
+
+    Returns:
+        list: 区間の順に並んだ各タスクの結果
+    """
+    base_primes = _base_primes(hi)
+    span = 2 * SEGMENT_SIZE
+    # 負荷が偏らないよう、ワーカー数より多めのタスクに分ける（セグメント境界に揃える）
+    step = max(span, -(-(hi - lo) // (workers * 8 * span)) * span)
+    bounds = [(start, min(start + step, hi)) for start in range(lo, hi, step)]
+    if workers == 1 or len(bounds) == 1:
+        return [task(a, b, base_primes) for a, b in bounds]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(np.array(base_primes, dtype=np.int64),)) as executor:
+        return list(executor.map(task, *zip(*bounds)))
+
+
+def count_primes(lo, hi, workers=None):
+    """
+    [lo, hi) の素数の個数を複数プロセスで数える
+
+    範囲をセグメント単位のタスクに分け、各ワーカーは共有の基底素数表で
+    自分の区間をふるって個数だけを返す。
+
+    Args:
+        lo: 区間の下限（この値を含む）
+        hi: 区間の上限（この値を含まない）
+        workers: ワーカープロセス数。None なら CPU コア数
+
+    Returns:
+        int: 区間内の素数の個数
+    """
+    workers = workers or os.cpu_count() or 1
+    count = 1 if lo <= 2 < hi else 0
+    lo = max(lo, 3)
+    if lo >= hi:
+        return count
+    return count + sum(_run_range_tasks(_count_primes_task, lo, hi, workers))
+
+
+def primes_in_range(lo, hi, workers=None):
+    """
+    [lo, hi) の素数を複数プロセスで列挙する
+
+    各ワーカーは結果を Python のリストではなく NumPy 配列で返す。
+
+    Args:
+        lo: 区間の下限（この値を含む）
+        hi: 区間の上限（この値を含まない）
+        workers: ワーカープロセス数。None なら CPU コア数
+
+    Returns:
+        np.ndarray: 区間内の素数の配列（np.int64）
+    """
+    workers = workers or os.cpu_count() or 1
+    parts = [np.array([2], dtype=np.int64)] if lo <= 2 < hi else []
+    lo = max(lo, 3)
+    if lo < hi:
+        parts.extend(_run_range_tasks(_primes_task, lo, hi, workers))
+    if not parts:
+        return np.empty(0, dtype=np.int64)
+    return np.concatenate(parts)
+
+
+def iter_primes_in_range(lo, hi, workers=None):
+    """
+    [lo, hi) の素数を複数プロセスで求め、タスクごとに NumPy 配列で小さい順に返すジェネレータ
+
+    primes_in_range と違い、タスクの大きさを STREAM_TASK_SEGMENTS セグメントに固定し、
+    結果を待っているタスクをワーカー数の2倍までにする。
+    そのため使用メモリは範囲の大きさによらず、結果を書き出しながら処理できる。
+
+    Args:
+        lo: 区間の下限（この値を含む）
+        hi: 区間の上限（この値を含まない）
+        workers: ワーカープロセス数。None なら CPU コア数
+
+    Yields:
+        np.ndarray: タスクの区間内の素数の配列（np.int64）
+    """
+    workers = workers or os.cpu_count() or 1
+    if lo <= 2 < hi:
+        yield np.array([2], dtype=np.int64)
+    lo = max(lo, 3)
+    if lo >= hi:
+        return
+    base_primes = _base_primes(hi)
+    step = 2 * SEGMENT_SIZE * STREAM_TASK_SEGMENTS
+    bounds = ((start, min(start + step, hi)) for start in range(lo, hi, step))
+    if workers == 1:
+        for a, b in bounds:
+            yield _primes_task(a, b, base_primes)
+        return
+    pending = collections.deque()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(np.array(base_primes, dtype=np.int64),)) as executor:
+        try:
+            for a, b in bounds:
+                pending.append(executor.submit(_primes_task, a, b))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # 途中で止められたら、まだ始まっていないタスクは取り消す
+            for future in pending:
+                future.cancel()
+
+
+# ==== 8. 高速素数判定（事前ふるい + 決定的ミラー・ラビン法） ====
+# 事前ふるいに使う小さな素数（1000未満）とその積
+_SMALL_PRIMES = list_primes_optimized(1000)
+_SMALL_PRIMES_SET = frozenset(_SMALL_PRIMES)
+_SMALL_PRIMES_PRODUCT = math.prod(_SMALL_PRIMES)
+# 小さな素数で割り切れない数のうち、この値未満のものは素数と確定する
+_TRIAL_LIMIT = 1009 * 1009  # 1009 は1000より大きい最小の素数
+
+
+def is_prime_fast(n):
+    """
+    事前ふるいと決定的ミラー・ラビン法による素数判定
+
+    まず1000未満の素数の積との最大公約数で小さな素因数を一度に調べ、
+    残ったものだけを決定的ミラー・ラビン法で判定する。
+
+    Args:
+        n: 判定する整数
+
+    Returns:
+        bool: nが素数ならTrue（n < 3.3*10^24 の範囲で確定。それ以上は BPSW 判定）
+    """
+    if n < 1000:
+        return n in _SMALL_PRIMES_SET
+    if math.gcd(n, _SMALL_PRIMES_PRODUCT) != 1:
+        return False
+    if n < _TRIAL_LIMIT:
+        return True
+    return miller_rabin(n, deterministic=True)
+
+
+def _powmod_array(base, exp, mod):
+    """
+    (base ** exp) % mod を要素ごとに計算する（np.uint64、mod < 2^32）
+
+    Args:
+        base: 底の配列
+        exp: 指数の配列
+        mod: 法の配列
+
+    Returns:
+        np.ndarray: 計算結果の配列
+    """
+    result = np.ones_like(mod)
+    base = base % mod
+    exp = exp.copy()
+    while exp.any():
+        odd = (exp & 1).astype(bool)
+        result = np.where(odd, result * base % mod, result)
+        base = base * base % mod
+        exp >>= 1
+    return result
+
+
+def _miller_rabin_array(n):
+    """
+    2^32 未満の奇数の配列をまとめて決定的ミラー・ラビン法で判定する
+
+    法が 2^32 未満なので、掛け算の結果は np.uint64 に収まる。
+    底 (2, 7, 61) は 4,759,123,141 未満のすべての数で判定が確定する。
+
+    Args:
+        n: 判定する奇数の配列（np.uint64、_TRIAL_LIMIT 以上 2^32 未満）
+
+    Returns:
+        np.ndarray: 素数ならTrueとなる bool 配列
+    """
+    # n-1 = 2^r * d の形に分解する
+    d = n - 1
+    r = np.zeros_like(n)
+    even = (d & 1) == 0
+    while even.any():
+        d = np.where(even, d >> 1, d)
+        r += even
+        even = (d & 1) == 0
+
+    result = np.ones(n.shape, dtype=bool)
+    max_r = int(r.max()) if len(r) else 0
+    for a in (2, 7, 61):
+        x = _powmod_array(np.full_like(n, a), d, n)
+        ok = (x == 1) | (x == n - 1)
+        for i in range(1, max_r):
+            x = x * x % n
+            ok |= (x == n - 1) & (i < r)
+        result &= ok
+    return result
+
+
+# 2^64 未満のすべての数で判定が確定するミラー・ラビン法の底（Jim Sinclair による7つの組）
+_MR_WITNESSES_64 = (2, 325, 9375, 28178, 450775, 9780504, 1795265022)
+# 64ビットのミラー・ラビン法で一度に処理する要素数（一時配列がキャッシュに収まる程度）
+_MR64_CHUNK = 1 << 14
+# 64ビットのべき乗で一度に処理する指数のビット数（スライド窓の幅）
+_MR64_WINDOW = 4
+_LOW32 = np.uint64(0xFFFFFFFF)
+_SHIFT32 = np.uint64(32)
+
+
+def _mulhi64(a0, a1, b0, b1):
+    """
+    64ビット同士の積の上位64ビットを、32ビットずつに分けた値から求める（np.uint64）
+
+    Args:
+        a0, a1: 1つ目の数の下位・上位32ビット
+        b0, b1: 2つ目の数の下位・上位32ビット
+
+    Returns:
+        np.ndarray: 積の上位64ビット
+    """
+    p00 = a0 * b0
+    p01 = a0 * b1
+    p10 = a1 * b0
+    mid = (p00 >> _SHIFT32) + (p01 & _LOW32) + (p10 & _LOW32)
+    return a1 * b1 + (p01 >> _SHIFT32) + (p10 >> _SHIFT32) + (mid >> _SHIFT32)
+
+
+def _montgomery_setup(n):
+    """
+    奇数の法 n の配列について、モンゴメリ乗算（R = 2^64）に使う値をまとめる
+
+    n^-1 mod 2^64 はニュートン法で求める（n * n ≡ 1 mod 8 から始め、1回ごとに正しいビット数が倍になる）。
+
+    Returns:
+        tuple: (n, n の下位32ビット, n の上位32ビット, n^-1 mod 2^64)
+    """
+    inv = n.copy()
+    for _ in range(5):
+        inv *= np.uint64(2) - n * inv
+    return n, n & _LOW32, n >> _SHIFT32, inv
+
+
+def _montgomery_mul(a, b, mod):
+    """
+    モンゴメリ乗算 a * b * R^-1 mod n を要素ごとに計算する（np.uint64、R = 2^64）
+
+    m = (a*b mod 2^64) * n^-1 とすると a*b - m*n の下位64ビットは 0 になるので、
+    上位64ビットどうしの差 hi(a*b) - hi(m*n) が結果になる（負なら n を足す）。
+    足し算をしないので、n が 2^63 以上でもあふれない。
+
+    Args:
+        a, b: モンゴメリ表現の値の配列（n 未満）
+        mod: _montgomery_setup の結果
+
+    Returns:
+        np.ndarray: a * b * R^-1 mod n
+    """
+    n, n0, n1, inv = mod
+    hi = _mulhi64(a & _LOW32, a >> _SHIFT32, b & _LOW32, b >> _SHIFT32)
+    m = a * b * inv
+    mh = _mulhi64(m & _LOW32, m >> _SHIFT32, n0, n1)
+    return hi - mh + n * (hi < mh)
+
+
+def _montgomery_square(a, mod):
+    """_montgomery_mul(a, a, mod) と同じ値を、上位ビットの部分積を1つ減らして計算する"""
+    n, n0, n1, inv = mod
+    a0 = a & _LOW32
+    a1 = a >> _SHIFT32
+    p00 = a0 * a0
+    p01 = a0 * a1
+    mid = (p00 >> _SHIFT32) + ((p01 & _LOW32) << np.uint64(1))
+    hi = a1 * a1 + ((p01 >> _SHIFT32) << np.uint64(1)) + (mid >> _SHIFT32)
+    m = a * a * inv
+    mh = _mulhi64(m & _LOW32, m >> _SHIFT32, n0, n1)
+    return hi - mh + n * (hi < mh)
+
+
+def _miller_rabin_array64(n):
+    """
+    2^32 以上 2^64 未満の奇数の配列をまとめて決定的ミラー・ラビン法で判定する
+
+    掛け算の結果が np.uint64 に収まらないので、モンゴメリ乗算（_montgomery_mul）を使う。
+    べき乗は指数を _MR64_WINDOW ビットずつ見るスライド窓法で行い、
+    ある底で合成数と分かった要素は次の底からは計算しない。
+
+    Args:
+        n: 判定する奇数の配列（np.uint64、2^32 以上）
+
+    Returns:
+        np.ndarray: 素数ならTrueとなる bool 配列
+    """
+    result = np.empty(n.shape, dtype=bool)
+    for start in range(0, len(n), _MR64_CHUNK):
+        result[start:start + _MR64_CHUNK] = _miller_rabin_chunk64(n[start:start + _MR64_CHUNK])
+    return result
+
+
+def _miller_rabin_chunk64(n):
+    """_miller_rabin_array64 の1チャンク分の判定"""
+    # R mod n（モンゴメリ表現の1）と、R^2 mod n（モンゴメリ表現への変換に使う）
+    one = (np.uint64(0) - n) % n
+    r2 = one
+    for _ in range(64):
+        r2 = r2 + r2 - n * (r2 >= n - r2)
+
+    # n-1 = 2^r * d の形に分解する
+    d = n - np.uint64(1)
+    r = np.zeros_like(n)
+    even = (d & np.uint64(1)) == 0
+    while even.any():
+        d = np.where(even, d >> np.uint64(1), d)
+        r += even
+        even = (d & np.uint64(1)) == 0
+
+    width = 1 << _MR64_WINDOW
+    result = np.ones(n.shape, dtype=bool)
+    idx = np.arange(len(n))
+    for a in _MR_WITNESSES_64:
+        if len(idx) == 0:
+            break
+        mod = _montgomery_setup(n[idx])
+        nn, dd, rr, unit = mod[0], d[idx], r[idx], one[idx]
+        base = np.uint64(a) % nn
+        divisible = base == 0
+        base = _montgomery_mul(base, r2[idx], mod)
+        # base^0, base^1, ..., base^(width-1) の表
+        table = np.empty((width, len(nn)), dtype=np.uint64)
+        table[0] = unit
+        for j in range(1, width):
+            table[j] = _montgomery_mul(table[j - 1], base, mod)
+        cols = np.arange(len(nn))
+        top = -(-int(dd.max()).bit_length() // _MR64_WINDOW) * _MR64_WINDOW
+        x = None
+        for shift in range(top - _MR64_WINDOW, -1, -_MR64_WINDOW):
+            digit = ((dd >> np.uint64(shift)) & np.uint64(width - 1)).astype(np.intp)
+            if x is None:
+                x = table[digit, cols]
+                continue
+            for _ in range(_MR64_WINDOW):
+                x = _montgomery_square(x, mod)
+            x = _montgomery_mul(x, table[digit, cols], mod)
+        minus_one = nn - unit
+        ok = (x == unit) | (x == minus_one) | divisible
+        for i in range(1, int(rr.max())):
+            x = _montgomery_square(x, mod)
+            ok |= (x == minus_one) & (i < rr)
+        result[idx[~ok]] = False
+        idx = idx[ok]
+    return result
+
+
+def is_prime_many(values):
+    """
+    多数の整数をまとめて素数判定する
+
+    np.ndarray の整数配列が渡された場合は、小さな素数での試し割りと
+    ミラー・ラビン法をベクトル演算で行う（2^32 以上はモンゴメリ乗算を使う）。
+
+    Args:
+        values: 判定する整数の配列またはイテラブル
+
+    Returns:
+        np.ndarray: 各要素が素数ならTrueとなる bool 配列
+    """
+    if not (isinstance(values, np.ndarray) and values.dtype.kind in "iu"):
+        return np.fromiter((is_prime_fast(int(v)) for v in values), dtype=bool)
+
+    result = np.zeros(values.shape, dtype=bool)
+    # 負の数は素数ではないので、0として扱う
+    n = np.where(values > 0, values, 0).astype(np.uint64).ravel()
+    flat = result.ravel()
+
+    # 1000未満の数は表引きで判定する
+    small = n < 1000
+    is_small_prime = np.zeros(1000, dtype=bool)
+    is_small_prime[_SMALL_PRIMES] = True
+    flat[small] = is_small_prime[n[small]]
+
+    # 残りの数に小さな素数で試し割りし、割り切れたものを候補から外していく
+    idx = np.flatnonzero(~small)
+    cand = n[idx]
+    for start in range(0, len(_SMALL_PRIMES), 16):
+        keep = np.ones(len(cand), dtype=bool)
+        for p in _SMALL_PRIMES[start:start + 16]:
+            keep &= cand % p != 0
+        idx, cand = idx[keep], cand[keep]
+
+    # 試し割りで残った _TRIAL_LIMIT 未満の数は素数
+    done = cand < _TRIAL_LIMIT
+    flat[idx[done]] = True
+    idx, cand = idx[~done], cand[~done]
+
+    # 2^32 未満は np.uint64 の掛け算で、それ以上はモンゴメリ乗算でまとめて判定する
+    mid = cand < (1 << 32)
+    flat[idx[mid]] = _miller_rabin_array(cand[mid])
+    flat[idx[~mid]] = _miller_rabin_array64(cand[~mid])
+    return flat.reshape(values.shape)
+
+
+# ==== 9. 素数表キャッシュ（mmap によるビット列の永続化） ====
+class PrimeTable:
+    """
+    篩の結果を奇数1ビットのビット列として保持し、繰り返しの問い合わせに答えるクラス
+
+    ビット列はファイルに生のまま保存でき、次回起動時は mmap でコピーせずに開き直す。
+    ブロックごとのビット数の累積和（ランク索引）を持つので、
+    is_prime(n) は O(1)、pi(n) は O(1)、nth_prime(k) は O(log n) で答えられる。
+    上限を超える問い合わせが来たら、足りない範囲だけ区間篩で追加する。
+
+    ビット i（バイト i//8 の下位から i%8 番目）が奇数 2*i + 3 に対応する。
+    """
+
+    # ランク索引の1ブロックあたりのバイト数（ファイルの大きさもこの倍数にする）
+    BLOCK_BYTES = 64
+    BLOCK_BITS = BLOCK_BYTES * 8
+
+    def __init__(self, limit=1 << 20, path=None):
+        """
+        Args:
+            limit: 最初に篩にかける上限
+            path: ビット列を保存するファイルのパス。None ならメモリ上だけで保持する
+        """
+        self.path = path
+        self._mmap = None
+        if path is not None and os.path.exists(path):
+            self._open(path)
+            self._rank = np.zeros(1, dtype=np.int64)
+            self._update_rank(0)
+            if limit > self.limit:
+                self.extend(limit)
+        else:
+            self._set_buffer(bytearray())
+            self._rank = np.zeros(1, dtype=np.int64)
+            self.extend(limit)
+
+    @property
+    def limit(self):
+        """このテーブルで判定できる最大の数"""
+        return 2 * len(self._view) * 8 + 1
+
+    def _set_buffer(self, buffer):
+        """ビット列のバッファを差し替え、コピーなしのビューを作り直す"""
+        self._buffer = buffer
+        self._view = memoryview(buffer)
+        self._bits = np.frombuffer(self._view, dtype=np.uint8)
+
+    def _release_buffer(self):
+        """mmap を閉じられるように、バッファへの参照をすべて手放す"""
+        self._bits = None
+        self._view.release()
+        self._buffer = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def _open(self, path):
+        """保存済みのビット列を mmap で読み込み専用に開く"""
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size % self.BLOCK_BYTES:
+                raise ValueError(f"{path} の大きさが {self.BLOCK_BYTES} バイトの倍数ではありません")
+            if size == 0:
+                self._set_buffer(bytearray())
+                return
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._set_buffer(self._mmap)
+
+    def _update_rank(self, first_block):
+        """first_block 以降のブロックについてランク索引を計算する"""
+        blocks = self._bits[first_block * self.BLOCK_BYTES:].reshape(-1, self.BLOCK_BYTES)
+        counts = np.bitwise_count(blocks).sum(axis=1, dtype=np.int64)
+        self._rank = np.concatenate((self._rank[:first_block + 1],
+                                     self._rank[first_block] + np.cumsum(counts)))
+
+    def extend(self, n):
+        """
+        n まで判定できるようにビット列を伸ばす
+
+        償却計算量を抑えるため、少なくとも現在の2倍まで伸ばす。
+
+        Args:
+            n: 新しく判定できるようにしたい上限
+        """
+        if n <= self.limit:
+            return
+        old_bits = len(self._view) * 8
+        need_bits = max((n - 1) // 2, 2 * old_bits)
+        new_bits = -(-need_bits // self.BLOCK_BITS) * self.BLOCK_BITS
+        # 追加部分だけを区間篩でふるう
+        extra = np.full((new_bits - old_bits) // 8, 0xFF, dtype=np.uint8)
+        _mark_odd_bits(extra, old_bits, new_bits - old_bits, _base_primes(2 * new_bits + 2))
+
+        if self.path is None:
+            buffer = bytearray(self._view)
+            self._release_buffer()
+            buffer += extra.tobytes()
+            self._set_buffer(buffer)
+        else:
+            self._release_buffer()
+            with open(self.path, "ab") as f:
+                f.write(extra.tobytes())
+            self._open(self.path)
+        self._update_rank(old_bits // self.BLOCK_BITS)
+
+    def close(self):
+        """mmap を閉じる"""
+        self._release_buffer()
+        self._set_buffer(bytearray())
+        self._rank = np.zeros(1, dtype=np.int64)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def is_prime(self, n):
+        """
+        n が素数かを表引きで判定する
+
+        Args:
+            n: 判定する整数
+
+        Returns:
+            bool: nが素数ならTrue
+        """
+        if n < 3:
+            return n == 2
+        if n % 2 == 0:
+            return False
+        if n > self.limit:
+            self.extend(n)
+        i = (n - 3) // 2
+        return bool(self._view[i >> 3] >> (i & 7) & 1)
+
+    def pi(self, n):
+        """
+        n 以下の素数の個数 π(n) をランク索引で求める
+
+        Args:
+            n: 上限
+
+        Returns:
+            int: n以下の素数の個数
+        """
+        if n < 3:
+            return 1 if n == 2 else 0
+        if n > self.limit:
+            self.extend(n)
+        # 3, 5, ..., n 以下の最大の奇数 までのビット数
+        m = (n - 1) // 2
+        block, rem = divmod(m, self.BLOCK_BITS)
+        start = block * self.BLOCK_BYTES
+        partial = int.from_bytes(self._view[start:start + (rem + 7) // 8], "little")
+        partial &= (1 << rem) - 1
+        return 1 + int(self._rank[block]) + partial.bit_count()
+
+    def nth_prime(self, k):
+        """
+        k 番目の素数を求める（1番目は2）
+
+        Args:
+            k: 何番目の素数か（1以上）
+
+        Returns:
+            int: k番目の素数
+        """
+        if k < 1:
+            raise ValueError("k は1以上で指定してください")
+        if k == 1:
+            return 2
+        target = k - 1  # 奇素数の中での順位
+        while self._rank[-1] < target:
+            # p_k < k(log k + log log k)（k >= 6）を目安に伸ばす
+            estimate = int(k * (math.log(k) + math.log(math.log(k)))) if k >= 6 else 13
+            self.extend(max(estimate, self.limit + 1))
+        # ランク索引を二分探索して、target 番目のビットを含むブロックを探す
+        block = int(np.searchsorted(self._rank, target, side="left")) - 1
+        remaining = target - int(self._rank[block])
+        i = block * self.BLOCK_BYTES
+        while True:
+            byte = self._view[i]
+            count = byte.bit_count()
+            if count >= remaining:
+                break
+            remaining -= count
+            i += 1
+        for bit in range(8):
+            if byte >> bit & 1:
+                remaining -= 1
+                if remaining == 0:
+                    return 2 * (8 * i + bit) + 3
+
+
+# ==== 10. 素数計数関数 π(x)（Lucy_Hedgehog 法） ====
+# この値未満の x は篩で直接数える
+_PRIME_PI_SIEVE_LIMIT = 1 << 16
+
+
+def prime_pi(x):
+    """
+    x 以下の素数の個数 π(x) を Lucy_Hedgehog 法で求める
+
+    S(v) を「v 以下で、これまでに処理した素数の倍数として除かれていない 2 以上の数の個数」とし、
+    x // i の形で表せる O(√x) 個の v についてだけ S(v) を保持する。
+    素数 p ごとに S(v) -= S(v // p) - S(p - 1) と更新すると、最後に S(x) = π(x) になる。
+    計算量は O(x^(3/4))、メモリは O(√x) で、更新は NumPy でまとめて行う。
+
+    Args:
+        x: 上限（2^63 未満）
+
+    Returns:
+        int: x以下の素数の個数
+    """
+    if x < _PRIME_PI_SIEVE_LIMIT:
+        return len(sieve_bitpacked(x))
+
+    r = math.isqrt(x)
+    # small[v] = S(v)（v <= r）、large[i] = S(x // i)（1 <= i <= r）
+    small = np.arange(-1, r, dtype=np.int64)
+    small[0] = 0
+    large = np.zeros(r + 1, dtype=np.int64)
+    large[1:] = x // np.arange(1, r + 1, dtype=np.int64) - 1
+
+    # √x 以下の素数は既存の篩で求める
+    for p in list_primes_optimized(r):
+        sp = int(small[p - 1])
+        p2 = p * p
+        # large は x // i >= p^2 となる i まで更新する
+        lim = min(r, x // p2)
+        # i*p <= r なら S(x // (i*p)) は large[i*p]、そうでなければ small[x // (i*p)]
+        mid = min(lim, r // p)
+        large[1:mid + 1] -= large[p:mid * p + 1:p] - sp
+        if lim > mid:
+            i = np.arange(mid + 1, lim + 1, dtype=np.int64)
+            large[mid + 1:lim + 1] -= small[x // (i * p)] - sp
+        # small は v >= p^2 の範囲だけ更新する（右辺は更新前の値で計算される）
+        if p2 <= r:
+            v = np.arange(p2, r + 1, dtype=np.int64)
+            small[p2:] -= small[v // p] - sp
+    return int(large[1])
+
+
+# ==== 11. 素因数分解 ====
+# 最小素因数表を作るときの既定の上限と、一括分解で自動的に広げる上限
+_SPF_DEFAULT_LIMIT = 1 << 20
+_SPF_MAX_LIMIT = 1 << 24
+# 車輪法の試し割りで調べる上限（これより大きな素因数はポラード・ロー法で探す）
+_WHEEL_TRIAL_LIMIT = 1 << 8
+# 7 から始めて 2, 3, 5 の倍数を飛ばすための増分（mod 30 の車輪）
+_WHEEL_INCREMENTS = (4, 2, 4, 2, 4, 6, 2, 6)
+
+# 最小素因数表のキャッシュ（_spf_table で作られる）
+_SPF_TABLE = None
+_SPF_VIEW = None
+
+
+def smallest_prime_factor_table(n):
+    """
+    0 から n までの各数の最小素因数の表を作る
+
+    Args:
+        n: 表の上限（2^32 未満）
+
+    Returns:
+        np.ndarray: spf[i] が i の最小素因数となる np.uint32 配列（spf[0] = spf[1] = 0）
+    """
+    spf = np.zeros(n + 1, dtype=np.uint32)
+    for p in list_primes_optimized(math.isqrt(n)):
+        # p の倍数のうち、まだ小さい素因数が見つかっていないものに p を入れる
+        view = spf[p * p::p]
+        view[view == 0] = p
+    # 最後まで残ったものは素数（自分自身が最小素因数）
+    rest = np.flatnonzero(spf == 0)
+    spf[rest] = rest
+    spf[:2] = 0
+    return spf
+
+
+def _spf_table(limit):
+    """
+    limit 以上を扱える最小素因数表を返す（必要なら作り直してキャッシュする）
+
+    Args:
+        limit: 表で扱いたい上限
+
+    Returns:
+        memoryview: 最小素因数表のビュー（添字で Python の int が得られる）
+    """
+    global _SPF_TABLE, _SPF_VIEW
+    if _SPF_TABLE is None or len(_SPF_TABLE) <= limit:
+        _SPF_TABLE = smallest_prime_factor_table(max(limit, _SPF_DEFAULT_LIMIT))
+        _SPF_VIEW = memoryview(_SPF_TABLE)
+    return _SPF_VIEW
+
+
+def _pollard_brent(n):
+    """
+    Brent の改良版ポラード・ロー法で合成数 n の非自明な約数を1つ探す
+
+    Args:
+        n: 奇数の合成数
+
+    Returns:
+        int: n の約数（1 < d < n）
+    """
+    while True:
+        y = random.randrange(1, n)
+        c = random.randrange(1, n)
+        m = 128  # gcd をまとめて取る間隔
+        g = r = q = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+            r *= 2
+        if g == n:
+            # まとめすぎて約数を通り過ぎたので、1歩ずつやり直す
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if g != n:
+            return g
+        # 失敗したら乱数を変えてやり直す
+
+
+def _factor_large(n, factors):
+    """
+    小さな素因数を取り除いた n を、素数判定とポラード・ロー法で分解して factors に加える
+
+    Args:
+        n: 分解する数
+        factors: 素因数とその指数を集める辞書（この関数で書き換える）
+    """
+    stack = [n]
+    while stack:
+        m = stack.pop()
+        if m == 1:
+            continue
+        if m < len(_SPF_VIEW):
+            while m > 1:
+                p = _SPF_VIEW[m]
+                factors[p] = factors.get(p, 0) + 1
+                m //= p
+        elif is_prime_fast(m):
+            factors[m] = factors.get(m, 0) + 1
+        else:
+            d = _pollard_brent(m)
+            stack.append(d)
+            stack.append(m // d)
+
+
+def factorize(n):
+    """
+    n を素因数分解する
+
+    最小素因数表に収まる数は表をたどるだけで分解する。
+    それより大きな数は、車輪法の試し割りで小さな素因数を取り除き、
+    残りをミラー・ラビン法で判定しながらポラード・ロー法で分割する。
+
+    Args:
+        n: 分解する整数（1以上）
+
+    Returns:
+        dict: 素因数をキー、指数を値とする辞書（素因数の昇順）
+    """
+    if n < 1:
+        raise ValueError("n は1以上で指定してください")
+    spf = _spf_table(0)
+    factors = {}
+    if n < len(spf):
+        while n > 1:
+            p = spf[n]
+            factors[p] = factors.get(p, 0) + 1
+            n //= p
+        return factors
+
+    # 2, 3, 5 で割り切れるだけ割る
+    for p in (2, 3, 5):
+        while n % p == 0:
+            factors[p] = factors.get(p, 0) + 1
+            n //= p
+    # 車輪法で 2, 3, 5 の倍数を飛ばしながら試し割りする
+    p, i = 7, 0
+    while p <= _WHEEL_TRIAL_LIMIT and p * p <= n:
+        while n % p == 0:
+            factors[p] = factors.get(p, 0) + 1
+            n //= p
+        p += _WHEEL_INCREMENTS[i]
+        i = (i + 1) % 8
+    if n > 1 and p * p > n:
+        # 残りは素数
+        factors[n] = factors.get(n, 0) + 1
+    else:
+        _factor_large(n, factors)
+    return dict(sorted(factors.items()))
+
+
+def factorize_many(values):
+    """
+    多数の整数をまとめて素因数分解する
+
+    最初に入力の大きさに合わせて最小素因数表を一度だけ作り（上限 _SPF_MAX_LIMIT）、
+    すべての呼び出しで使い回す。
+
+    Args:
+        values: 分解する整数のイテラブル（各要素は1以上）
+
+    Returns:
+        list: 各要素の素因数分解の結果（factorize と同じ形式の辞書）のリスト
+    """
+    values = [int(v) for v in values]
+    if values:
+        _spf_table(min(max(values), _SPF_MAX_LIMIT))
+    return [factorize(v) for v in values]
+
+
 # ==== 比較関数 ====
 def benchmark_prime_algorithms():
     """
-    各素数判定アルゴリズムのパフォーマンスを比較
+    各素数判定アルゴリズムの結果を照合してから、ベンチマークで性能を比較
+
+    計測は benchmark.py のベンチマークに任せる（繰り返し計測して中央値・95パーセンタイル・
+    ピークメモリを記録する）。結果を JSON に保存したり、ベースラインと比較したりする場合は
+    python benchmark.py run を使う。
     """
     print("===== 素数判定アルゴリズムのベンチマーク =====")
-    
-    # 小さな数のテスト
-    small_number = 10007  # 素数
-    
-    print(f"\n1. 試し割り法で {small_number} が素数かチェック:")
-    start = time.time()
-    result = is_prime_trial_division(small_number)
-    elapsed = time.time() - start
-    print(f"   結果: {result}, 実行時間: {elapsed:.6f}秒")
-    
-    print(f"\n3. ミラー・ラビン法で {small_number} が素数かチェック:")
-    start = time.time()
-    result = miller_rabin(small_number)
-    elapsed = time.time() - start
-    print(f"   結果: {result}, 実行時間: {elapsed:.6f}秒")
-    
-    # 中程度の範囲のテスト
+
+    # 結果の検証
     range_limit = 10000
-    
-    print(f"\n2. エラトステネスの篩で {range_limit} 以下の素数を列挙:")
-    start = time.time()
     primes = sieve_of_eratosthenes(range_limit)
-    elapsed = time.time() - start
-    print(f"   素数の数: {len(primes)}, 実行時間: {elapsed:.6f}秒")
-    print(f"   最初の10個: {primes[:10]}")
-    print(f"   最後の10個: {primes[-10:]}")
-    
-    print(f"\n4. 最適化された方法で {range_limit} 以下の素数を列挙:")
-    start = time.time()
-    primes_opt = list_primes_optimized(range_limit)
-    elapsed = time.time() - start
-    print(f"   素数の数: {len(primes_opt)}, 実行時間: {elapsed:.6f}秒")
-    print(f"   最初の10個: {primes_opt[:10]}")
-    print(f"   最後の10個: {primes_opt[-10:]}")
-    
-    # 結果の検証
-    assert primes == primes_opt, "2つの方法で得られた素数リストが一致しません"
-    
-    # 大きな数のテスト
+    assert primes == list_primes_optimized(range_limit), "2つの方法で得られた素数リストが一致しません"
+    assert primes == list(segmented_sieve(0, range_limit + 1)), "区間篩で得られた素数リストが一致しません"
+    assert primes == sieve_bitpacked(range_limit).tolist(), "ビット詰め篩で得られた素数リストが一致しません"
+    assert prime_pi(range_limit) == len(primes), "π(x) の値が篩で数えた素数の個数と一致しません"
     large_number = 104729 * 104723  # 合成数
-    large_prime = 104729  # 素数
-    
-    print(f"\n大きな数のテスト:")
-    print(f"ミラー・ラビン法で {large_prime} が素数かチェック:")
-    start = time.time()
-    result = miller_rabin(large_prime)
-    elapsed = time.time() - start
-    print(f"   結果: {result}, 実行時間: {elapsed:.6f}秒")
-    
-    print(f"ミラー・ラビン法で {large_number} が素数かチェック:")
-    start = time.time()
-    result = miller_rabin(large_number)
-    elapsed = time.time() - start
-    print(f"   結果: {result}, 実行時間: {elapsed:.6f}秒")
+    assert not miller_rabin(large_number, deterministic=True), "合成数を素数と判定しました"
+    assert factorize(large_number) == {104723: 1, 104729: 1}, "素因数分解の結果が一致しません"
+    print(f"{range_limit} 以下の素数 {len(primes)} 個で各実装の結果が一致しました")
+
+    import benchmark
+    print(benchmark.format_results(benchmark.run_benchmarks(groups=["primes"])))
 
 
 # ==== インタラクティブテスト ====
@@ -301,7 +1555,178 @@ def interactive_test():
             break
 
 
+# ==== コマンドライン（一括処理） ====
+# 一度に読み込んで処理する行数
+CLI_CHUNK_SIZE = 1 << 16
+
+# 素数判定のアルゴリズム（is-prime サブコマンドで選択）
+_PRIMALITY_ALGORITHMS = {
+    "fast": is_prime_fast,
+    "deterministic": lambda n: miller_rabin(n, deterministic=True),
+    "miller-rabin": miller_rabin,
+    "trial": is_prime_trial_division,
+}
+
+
+def _read_int_chunks(stream, chunk_size=CLI_CHUNK_SIZE):
+    """
+    1行1整数のテキストを chunk_size 行ずつ整数のリストにして返すジェネレータ
+
+    入力全体を読み込まずに少しずつ処理するので、巨大なファイルでもメモリは一定になる。
+
+    Args:
+        stream: テキストのストリーム
+        chunk_size: 一度に読み込む行数
+
+    Yields:
+        list: 整数のリスト（空行は飛ばす）
+
+    Raises:
+        ValueError: 整数として読めない行があった場合（行番号を含む）
+    """
+    line_number = 0
+    while True:
+        lines = list(islice(stream, chunk_size))
+        if not lines:
+            return
+        try:
+            values = [int(line) for line in lines if line.strip()]
+        except ValueError:
+            # 失敗したときだけ、チャンクを先頭から見直して行番号を探す
+            for offset, line in enumerate(lines, line_number + 1):
+                try:
+                    int(line)
+                except ValueError:
+                    if line.strip():
+                        raise ValueError(f"{offset}行目が整数ではありません: {line.strip()!r}") from None
+            raise
+        line_number += len(lines)
+        yield values
+
+
+def _write_numbers(values, out, chunk_size=CLI_CHUNK_SIZE):
+    """
+    整数を1行1個ずつ、chunk_size 個ごとにまとめて書き出す
+
+    Args:
+        values: 整数のイテラブル（NumPy 配列も可）
+        out: 書き出し先のテキストストリーム
+        chunk_size: 一度に書き出す個数
+    """
+    if isinstance(values, np.ndarray):
+        for i in range(0, len(values), chunk_size):
+            out.write("\n".join(map(str, values[i:i + chunk_size].tolist())) + "\n")
+        return
+    values = iter(values)
+    while True:
+        chunk = list(islice(values, chunk_size))
+        if not chunk:
+            return
+        out.write("\n".join(map(str, chunk)) + "\n")
+
+
+def _cli_is_prime(args, out):
+    """is-prime サブコマンド: 各行の整数が素数なら1、そうでなければ0を付けて出力する"""
+    for values in _read_int_chunks(args.input):
+        if args.algorithm == "fast" and values and -(1 << 63) <= min(values) and max(values) < 1 << 63:
+            flags = is_prime_many(np.array(values, dtype=np.int64)).tolist()
+        else:
+            test = _PRIMALITY_ALGORITHMS[args.algorithm]
+            flags = [test(v) for v in values]
+        out.write("".join(f"{v}\t{int(f)}\n" for v, f in zip(values, flags)))
+
+
+def _cli_list(args, out):
+    """list サブコマンド: [lo, hi) の素数を1行1個ずつ出力する"""
+    if args.algorithm == "segmented":
+        _write_numbers(segmented_sieve(args.lo, args.hi), out)
+    elif args.algorithm == "bitpacked":
+        for primes in sieve_bitpacked_range(args.lo, args.hi):
+            _write_numbers(primes, out)
+    else:
+        for primes in iter_primes_in_range(args.lo, args.hi, workers=args.workers):
+            _write_numbers(primes, out)
+
+
+def _cli_count(args, out):
+    """count サブコマンド: [lo, hi) の素数の個数を出力する"""
+    if args.algorithm == "lucy":
+        count = prime_pi(args.hi - 1) - prime_pi(args.lo - 1) if args.lo < args.hi else 0
+    elif args.algorithm == "segmented":
+        count = sum(1 for _ in segmented_sieve(args.lo, args.hi))
+    else:
+        count = count_primes(args.lo, args.hi, workers=args.workers)
+    out.write(f"{count}\n")
+
+
+def _cli_factor(args, out):
+    """factor サブコマンド: 各行の整数を「n: p1 p2 ...」の形式で素因数分解して出力する"""
+    for values in _read_int_chunks(args.input):
+        lines = []
+        for v, factors in zip(values, factorize_many(values)):
+            primes = " ".join(" ".join([str(p)] * e) for p, e in factors.items())
+            lines.append(f"{v}: {primes}\n")
+        out.write("".join(lines))
+
+
+def main(argv=None):
+    """
+    コマンドラインから一括処理を実行する
+
+    Args:
+        argv: コマンドライン引数のリスト。None なら sys.argv[1:]
+
+    Returns:
+        int: 終了コード
+    """
+    parser = argparse.ArgumentParser(description="素数判定・列挙・計数・素因数分解の一括処理")
+    parser.add_argument("-o", "--output", help="出力先のファイル（省略時は標準出力）")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    is_prime = sub.add_parser("is-prime", help="1行1整数の入力を素数判定する")
+    is_prime.add_argument("input", nargs="?", type=argparse.FileType("r"), default=sys.stdin,
+                          help="入力ファイル（省略時は標準入力）")
+    is_prime.add_argument("--algorithm", choices=list(_PRIMALITY_ALGORITHMS), default="fast")
+    is_prime.set_defaults(func=_cli_is_prime)
+
+    list_cmd = sub.add_parser("list", help="[lo, hi) の素数を列挙する")
+    list_cmd.add_argument("lo", type=int)
+    list_cmd.add_argument("hi", type=int)
+    list_cmd.add_argument("--algorithm", choices=["segmented", "bitpacked", "parallel"],
+                          default="segmented")
+    list_cmd.add_argument("--workers", type=int, default=None, help="並列処理のワーカー数")
+    list_cmd.set_defaults(func=_cli_list)
+
+    count = sub.add_parser("count", help="[lo, hi) の素数の個数を数える")
+    count.add_argument("lo", type=int)
+    count.add_argument("hi", type=int)
+    count.add_argument("--algorithm", choices=["lucy", "segmented", "parallel"], default="lucy")
+    count.add_argument("--workers", type=int, default=None, help="並列処理のワーカー数")
+    count.set_defaults(func=_cli_count)
+
+    factor = sub.add_parser("factor", help="1行1整数の入力を素因数分解する")
+    factor.add_argument("input", nargs="?", type=argparse.FileType("r"), default=sys.stdin,
+                        help="入力ファイル（省略時は標準入力）")
+    factor.set_defaults(func=_cli_factor)
+
+    args = parser.parse_args(argv)
+    try:
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as out:
+                args.func(args, out)
+        else:
+            args.func(args, sys.stdout)
+            sys.stdout.flush()
+    except ValueError as e:
+        # 入力の誤りはトレースバックではなくメッセージで知らせる（終了コード 2）
+        parser.error(str(e))
+    return 0
+
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(main())
+
     print("素数判定アルゴリズム集")
     print("=" * 30)
     print("このプログラムでは4つの素数判定アルゴリズムの実装と比較を行います。")
@@ -1,20 +1,70 @@
-def is_palindrome_simple(text):
+import mmap
+import os
+import random
+import unicodedata
+from array import array
+from functools import lru_cache
+
+import numpy as np
+
+
+# ==== 正規化 ====
+# 各判定関数は normalizer 引数で正規化の方法（文字列を受け取り、比較用の文字列を返す関数）を受け取る。
+# ASCII 文字列の正規化に使う変換表（大文字を小文字にし、英数字以外を削除する）
+_ASCII_LOWER = bytes.maketrans(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ", b"abcdefghijklmnopqrstuvwxyz")
+_ASCII_DELETE = bytes(b for b in range(128) if not chr(b).isalnum())
+
+
+def simple_normalize(text):
+    """
+    1文字ずつ isalnum() で英数字だけを残し、lower() で小文字にする正規化
+    ASCII だけの文字列は変換表でまとめて処理する
+    """
+    if text.isascii():
+        return text.encode("ascii").translate(_ASCII_LOWER, _ASCII_DELETE).decode("ascii")
+    return ''.join(char.lower() for char in text if char.isalnum())
+
+
+def unicode_normalize(text):
+    """
+    NFKC と casefold() でそろえてから英数字だけを残す正規化（既定）
+    全角文字は半角に、結合文字は合成済みの文字に、ß は ss にそろう。
+    ASCII だけの文字列では simple_normalize と同じ結果になるので、変換表でまとめて処理する
+    """
+    if text.isascii():
+        return text.encode("ascii").translate(_ASCII_LOWER, _ASCII_DELETE).decode("ascii")
+    folded = unicodedata.normalize("NFKC", unicodedata.normalize("NFKC", text).casefold())
+    return ''.join(filter(str.isalnum, folded))
+
+
+# ASCII 文字列を変換表で正規化したものと同じ結果になる正規化（一括判定などの高速化に使う）
+_ASCII_COMPATIBLE = (simple_normalize, unicode_normalize)
+
+
+@lru_cache(maxsize=1 << 16)
+def _normalize_cluster(normalizer, cluster):
+    """1文字（結合文字を含むまとまり）の正規化結果をキャッシュする"""
+    return normalizer(cluster)
+
+
+
+def is_palindrome_simple(text, normalizer=unicode_normalize):
     """
     シンプルな方法でパリンドロームを判定する関数
     文字列を反転して元の文字列と比較する
     """
-    # 文字列を小文字に変換し、スペースと記号を削除
-    cleaned_text = ''.join(char.lower() for char in text if char.isalnum())
+    # 文字列を正規化（英数字以外を削除し、大文字・小文字などをそろえる）
+    cleaned_text = normalizer(text)
     # 反転して比較
     return cleaned_text == cleaned_text[::-1]
 
-def is_palindrome_two_pointer(text):
+def is_palindrome_two_pointer(text, normalizer=unicode_normalize):
     """
     ポインタを使用した方法でパリンドロームを判定する関数
     左右から同時に文字を比較する
     """
-    # 文字列を小文字に変換し、スペースと記号を削除
-    cleaned_text = ''.join(char.lower() for char in text if char.isalnum())
+    # 文字列を正規化（英数字以外を削除し、大文字・小文字などをそろえる）
+    cleaned_text = normalizer(text)
     
     left, right = 0, len(cleaned_text) - 1
     while left < right:
@@ -25,12 +75,12 @@ def is_palindrome_two_pointer(text):
     
     return True
 
-def is_palindrome_recursive(text):
+def is_palindrome_recursive(text, normalizer=unicode_normalize):
     """
     再帰を使用してパリンドロームを判定する関数
     """
-    # 文字列を小文字に変換し、スペースと記号を削除
-    cleaned_text = ''.join(char.lower() for char in text if char.isalnum())
+    # 文字列を正規化（英数字以外を削除し、大文字・小文字などをそろえる）
+    cleaned_text = normalizer(text)
     
     def check_palindrome(s, left, right):
         # 基底ケース: 左ポインタが右ポインタを超えたら、パリンドロームである
@@ -44,29 +94,842 @@ def is_palindrome_recursive(text):
     
     return check_palindrome(cleaned_text, 0, len(cleaned_text) - 1)
 
-# テスト
-test_strings = [
-    "A man, a plan, a canal, Panama",
-    "race a car",
-    "Was it a car or a cat I saw?",
-    "No 'x' in Nixon",
-    "Not a palindrome",
-    "12321",
-    "Madam, I'm Adam",
-    "じいさんてんさいじ"
-]
-
-print("シンプルな方法:")
-for s in test_strings:
-    print(f'"{s}" -> {is_palindrome_simple(s)}')
-
-print("\nポインタを使用した方法:")
-for s in test_strings:
-    print(f'"{s}" -> {is_palindrome_two_pointer(s)}')
-
-print("\n再帰を使用した方法:")
-for s in test_strings:
-    print(f'"{s}" -> {is_palindrome_recursive(s)}')
+
+# 反復版で一度に比較する文字数
+_CHUNK_SIZE = 4096
+
+
+def is_palindrome_iterative(text, normalizer=unicode_normalize):
+    """
+    再帰を使わずにパリンドロームを判定する関数
+    is_palindrome_recursive と同じく外側から内側へ比較していくが、
+    1文字ずつ再帰する代わりに、左端からの部分文字列と右端からの部分文字列を反転したものを
+    _CHUNK_SIZE 文字ずつまとめて比較する。スタックを消費しないので長い文字列でも
+    RecursionError にならず、1文字ごとの関数呼び出しもない
+    """
+    # 文字列を正規化（英数字以外を削除し、大文字・小文字などをそろえる）
+    cleaned_text = normalizer(text)
+
+    n = len(cleaned_text)
+    half = n // 2
+    for left in range(0, half, _CHUNK_SIZE):
+        right = min(left + _CHUNK_SIZE, half)
+        # 左側の [left, right) と、右側の対応する範囲 [n-right, n-left) を反転したものを比較
+        if cleaned_text[left:right] != cleaned_text[n - right:n - left][::-1]:
+            return False
+    return True
+
+
+# ==== 部分文字列のパリンドローム（Manacher のアルゴリズム・回文木） ====
+class Manacher:
+    """
+    Manacher のアルゴリズムで、すべての中心について最長のパリンドロームを線形時間で求めるクラス
+
+    文字の間に区切りを挟んだ長さ 2n+1 の列を考え、位置 i を中心とするパリンドロームの
+    半径（元の文字列での長さ）を radii[i] に持つ。
+
+    extend() で文字列を後ろに追加するときは、末尾まで届いているパリンドロームのうち
+    最も左にある中心（_resume）から計算を再開し、再び末尾まで届く中心が見つかったところで止める。
+    それより右の中心はそのパリンドロームの内側にあり、半径は左右対称の位置の半径と
+    末尾までの距離から決まるので、_radius() で必要になったときに求める。
+    各中心の半径が確定するのは1回だけで、広げる操作は末尾を右に進めるので、
+    1文字ずつ追加しても全体で O(n) になる。
+
+    位置は normalizer で正規化した後の文字列での位置を表す。
+    """
+
+    def __init__(self, text="", normalizer=unicode_normalize):
+        self._normalizer = normalizer
+        # 正規化した文字列をコードポイントで保持する（1文字4バイト）
+        self._codes = array("I")
+        self._radii = array("q", [0])
+        # 末尾まで届いているパリンドロームのうち、最も左にある中心（これより左の半径は確定済み）
+        self._resume = 0
+        self._best = 0
+        self._best_center = 0
+        self.extend(text)
+
+    def __len__(self):
+        return len(self._codes)
+
+    def extend(self, text):
+        """
+        文字列を後ろに追加する
+
+        Args:
+            text: 追加する文字列（normalizer で正規化される）
+        """
+        cleaned_text = self._normalizer(text)
+        if not cleaned_text:
+            return
+        codes = self._codes
+        radii = self._radii
+        codes.extend(map(ord, cleaned_text))
+        m = 2 * len(codes) + 1
+        radii.extend(array("q", bytes(8 * (m - len(radii)))))
+
+        # _resume より左の半径は確定しているので、_resume から計算を再開する
+        center = self._resume
+        right = center + radii[center]
+        for i in range(self._resume, m):
+            r = min(right - i, radii[2 * center - i]) if i < right else 0
+            # 区切り同士（偶数番目）は常に一致し、奇数番目 k は元の文字 k // 2 に対応する
+            while i - r - 1 >= 0 and i + r + 1 < m:
+                left = i - r - 1
+                if left % 2 == 0 or codes[left >> 1] == codes[(i + r + 1) >> 1]:
+                    r += 1
+                else:
+                    break
+            radii[i] = r
+            if i + r > right:
+                center, right = i, i + r
+            if r > self._best:
+                self._best, self._best_center = r, i
+            # 末尾まで届いたら、これより右の中心は次の extend() か _radius() に任せる
+            if i + r == m - 1:
+                self._resume = i
+                break
+
+    def _radius(self, i):
+        """中心 i のパリンドロームの半径（_resume より右の中心は対称な位置から求める）"""
+        resume = self._resume
+        if i <= resume:
+            return self._radii[i]
+        return min(2 * len(self._codes) - i, self._radii[2 * resume - i])
+
+    def _span(self, i):
+        """中心 i のパリンドロームの (開始位置, 長さ) を返す"""
+        r = self._radius(i)
+        return (i - r) // 2, r
+
+    def longest(self):
+        """
+        最長のパリンドロームである部分文字列を返す
+
+        _resume より右の中心の半径は _resume の半径より小さいので、
+        確定済みの中心と _resume だけを見ればよい（extend() の中で更新している）。
+
+        Returns:
+            str: 最長のパリンドローム（正規化した後の文字列）
+        """
+        start, length = self._span(self._best_center)
+        return ''.join(map(chr, self._codes[start:start + length]))
+
+    def maximal_palindromes(self):
+        """
+        各中心について、それ以上広げられない（極大な）パリンドロームを返すジェネレータ
+
+        Yields:
+            tuple: (開始位置, 長さ)（長さ0のものは除く）
+        """
+        for i in range(1, 2 * len(self._codes)):
+            start, length = self._span(i)
+            if length:
+                yield start, length
+
+
+class PalindromicTree:
+    """
+    回文木（eertree）で、部分文字列のパリンドロームを数え上げるクラス
+
+    異なるパリンドロームが1つずつノードになる木で、1文字追加するごとに
+    償却 O(1) で「末尾で終わる最長のパリンドローム」を更新する。
+    ノード0は長さ -1 の仮想的な根、ノード1は空文字列の根。
+    """
+
+    def __init__(self, text="", normalizer=unicode_normalize):
+        self._normalizer = normalizer
+        self._codes = array("I")
+        self._length = [-1, 0]
+        self._link = [0, 0]  # 最長の真のパリンドローム接尾辞のノード
+        self._depth = [0, 0]  # パリンドローム接尾辞の数（link をたどれる回数）
+        self._next = [{}, {}]  # 両端に文字を付け足したパリンドロームへの辺
+        self._last = 1
+        self._longest_end = 0
+        self._longest_node = 1
+        self.total_count = 0  # パリンドロームである部分文字列の出現回数の合計
+        self.extend(text)
+
+    def __len__(self):
+        return len(self._codes)
+
+    @property
+    def distinct_count(self):
+        """異なるパリンドロームの部分文字列の数"""
+        return len(self._length) - 2
+
+    def _find(self, node, i, c):
+        """node から link をたどり、直前の文字が c であるパリンドローム接尾辞を探す"""
+        codes = self._codes
+        while True:
+            j = i - self._length[node] - 1
+            if j >= 0 and codes[j] == c:
+                return node
+            node = self._link[node]
+
+    def extend(self, text):
+        """
+        文字列を後ろに追加する
+
+        Args:
+            text: 追加する文字列（normalizer で正規化される）
+        """
+        for char in self._normalizer(text):
+            c = ord(char)
+            self._codes.append(c)
+            i = len(self._codes) - 1
+            cur = self._find(self._last, i, c)
+            node = self._next[cur].get(c)
+            if node is None:
+                node = len(self._length)
+                length = self._length[cur] + 2
+                link = 1 if length == 1 else self._next[self._find(self._link[cur], i, c)][c]
+                self._length.append(length)
+                self._link.append(link)
+                self._depth.append(self._depth[link] + 1)
+                self._next.append({})
+                self._next[cur][c] = node
+            self._last = node
+            self.total_count += self._depth[node]
+            if self._length[node] > self._length[self._longest_node]:
+                self._longest_node, self._longest_end = node, i + 1
+
+    def longest(self):
+        """
+        最長のパリンドロームである部分文字列を返す
+
+        Returns:
+            str: 最長のパリンドローム（正規化した後の文字列）
+        """
+        length = self._length[self._longest_node]
+        return ''.join(map(chr, self._codes[self._longest_end - length:self._longest_end]))
+
+    def longest_suffix_palindrome(self):
+        """
+        現在の末尾で終わる最長のパリンドロームの長さを返す
+
+        Returns:
+            int: 長さ
+        """
+        return self._length[self._last]
+
+
+# ==== 大量の短い文字列の一括判定 ====
+# 区切り文字 NUL を残す版（連結した文字列をまとめて正規化するときに使う）
+_ASCII_DELETE_KEEP_NUL = _ASCII_DELETE.replace(b"\x00", b"")
+
+
+def _classify_normalized(chars, starts, lengths):
+    """
+    正規化済みの文字の配列を、長さごとにまとめて NumPy で判定する
+
+    Args:
+        chars: 正規化済みの文字列を並べた配列（np.uint8 または np.uint32）
+        starts: 各文字列の chars 上の開始位置
+        lengths: 各文字列の長さ
+
+    Returns:
+        np.ndarray: 各文字列がパリンドロームならTrueとなる bool 配列
+    """
+    result = np.ones(len(lengths), dtype=bool)
+    # 長さでソートして、同じ長さのものをまとめて1つの2次元配列として比較する
+    order = np.argsort(lengths.astype(np.uint16) if len(lengths) and lengths.max() < 1 << 16 else lengths,
+                       kind="stable")
+    bounds = np.flatnonzero(np.diff(lengths[order])) + 1
+    for indices in np.split(order, bounds):
+        if len(indices) == 0:
+            continue
+        length = int(lengths[indices[0]])
+        if length <= 1:
+            continue
+        offsets = np.arange(length // 2)
+        front = chars[starts[indices, None] + offsets]
+        back = chars[starts[indices, None] + (length - 1 - offsets)]
+        result[indices] = (front == back).all(axis=1)
+    return result
+
+
+def _classify_parts(parts, dtype):
+    """
+    正規化済みのバイト列のリストを _classify_normalized で判定する
+
+    Args:
+        parts: 正規化済みの文字列をエンコードしたバイト列のリスト
+        dtype: 1文字を表す型（ASCII なら np.uint8、UTF-32 なら np.uint32）
+
+    Returns:
+        np.ndarray: 各要素がパリンドロームならTrueとなる bool 配列
+    """
+    itemsize = np.dtype(dtype).itemsize
+    lengths = np.fromiter(map(len, parts), dtype=np.int64, count=len(parts)) // itemsize
+    chars = np.frombuffer(b"".join(parts), dtype=dtype)
+    return _classify_normalized(chars, np.cumsum(lengths) - lengths, lengths)
+
+
+def classify_palindromes(strings, normalizer=unicode_normalize):
+    """
+    大量の文字列をまとめてパリンドローム判定する関数
+
+    ASCII の文字列は NUL で連結して bytes.translate で一度に正規化し、
+    1文字ずつの isalnum()/lower() を呼ばずに済ませる。それ以外は normalizer で
+    正規化して UTF-32 にする。正規化後の長さごとにまとめて NumPy の2次元配列にし、
+    前半と反転した後半をまとめて比較する。
+
+    Args:
+        strings: 文字列のイテラブル
+        normalizer: 正規化の方法
+
+    Returns:
+        np.ndarray: 各文字列がパリンドロームならTrueとなる bool 配列
+    """
+    strings = list(strings)
+    if not strings:
+        return np.zeros(0, dtype=bool)
+
+    ascii_compatible = normalizer in _ASCII_COMPATIBLE
+    joined = "\x00".join(strings)
+    if ascii_compatible and joined.isascii() and joined.count("\x00") == len(strings) - 1:
+        # すべて ASCII で NUL を含まなければ、連結したまま正規化し、NUL の位置で区切る
+        normalized = joined.encode("ascii").translate(_ASCII_LOWER, _ASCII_DELETE_KEEP_NUL)
+        chars = np.frombuffer(normalized + b"\x00", dtype=np.uint8)
+        ends = np.flatnonzero(chars == 0)
+        starts = np.concatenate(([0], ends[:-1] + 1))
+        return _classify_normalized(chars, starts, ends - starts)
+
+    # ASCII とそれ以外に分けて、それぞれまとめて判定する
+    ascii_indices, ascii_parts = [], []
+    other_indices, other_parts = [], []
+    for i, text in enumerate(strings):
+        if ascii_compatible and text.isascii():
+            ascii_indices.append(i)
+            ascii_parts.append(text.encode("ascii").translate(_ASCII_LOWER, _ASCII_DELETE))
+        else:
+            other_indices.append(i)
+            other_parts.append(normalizer(text).encode("utf-32-le"))
+    result = np.empty(len(strings), dtype=bool)
+    result[ascii_indices] = _classify_parts(ascii_parts, np.uint8)
+    result[other_indices] = _classify_parts(other_parts, np.uint32)
+    return result
+
+
+# ==== ファイル・mmap 上のストリーミング判定 ====
+# ASCII 文字を正規化した結果の表（英数字以外は空文字）
+_ASCII_NORMALIZED = [chr(b).lower() if chr(b).isalnum() else "" for b in range(128)]
+
+
+def _decode_at(buffer, pos):
+    """
+    pos から始まる UTF-8 の1文字をデコードする
+
+    Returns:
+        tuple: (文字, バイト数)
+    """
+    lead = buffer[pos]
+    if lead < 0x80:
+        return chr(lead), 1
+    # 先頭バイトから文字のバイト数を決める
+    length = 2 if lead < 0xE0 else 3 if lead < 0xF0 else 4
+    return str(buffer[pos:pos + length], "utf-8"), length
+
+
+@lru_cache(maxsize=1 << 12)
+def _joins_previous(char):
+    """
+    char が手前の文字と一緒に正規化される（NFKC で合成される）可能性があればTrue
+
+    一般カテゴリが M の結合文字のほか、分解すると結合文字で始まる文字
+    （半角の濁点・半濁点 U+FF9E, U+FF9F は U+3099, U+309A になる）と、
+    手前の字母と合成されるハングルの中声・終声字母（U+1160〜U+11FF）も含める。
+    """
+    if unicodedata.category(char)[0] == "M":
+        return True
+    first = unicodedata.normalize("NFKD", char)[:1]
+    return bool(first) and (unicodedata.combining(first) != 0 or "\u1160" <= first <= "\u11ff")
+
+
+def _forward_chars(buffer, start, end, normalizer):
+    """
+    UTF-8 のバイト列を前から1文字ずつデコードし、正規化した文字を返すジェネレータ
+
+    基底の文字と、後ろに続く手前の文字と合成されうる文字（_joins_previous）をまとめて正規化するので、
+    結合文字や半角カナの濁点を含む文字列でも文字列全体を正規化した場合と同じ結果になる。
+
+    Args:
+        buffer: UTF-8 のバイト列（bytes, mmap, memoryview など）
+        start: 読み始める位置
+        end: 読み終わる位置（この位置を含まない）
+        normalizer: 正規化の方法
+
+    Yields:
+        tuple: (元の文字の先頭バイト位置, 正規化した1文字)
+    """
+    ascii_table = _ASCII_NORMALIZED if normalizer in _ASCII_COMPATIBLE else None
+    pos = start
+    while pos < end:
+        lead = buffer[pos]
+        # ASCII 文字の後ろに結合文字が続かなければ表引きで済ませる
+        if lead < 0x80 and ascii_table is not None and (pos + 1 == end or buffer[pos + 1] < 0x80):
+            char = ascii_table[lead]
+            if char:
+                yield pos, char
+            pos += 1
+            continue
+        cluster, length = _decode_at(buffer, pos)
+        nxt = pos + length
+        while nxt < end and buffer[nxt] >= 0x80:
+            char, length = _decode_at(buffer, nxt)
+            if not _joins_previous(char):
+                break
+            cluster += char
+            nxt += length
+        for c in _normalize_cluster(normalizer, cluster):
+            yield pos, c
+        pos = nxt
+
+
+def _backward_chars(buffer, start, end, normalizer):
+    """
+    UTF-8 のバイト列を後ろから1文字ずつデコードし、正規化した文字を返すジェネレータ
+
+    継続バイト（0b10xxxxxx）をさかのぼって文字の先頭を探すので、
+    文字の途中から読み始めることはない。結合文字などは手前の基底の文字とまとめて正規化する。
+
+    Args:
+        buffer: UTF-8 のバイト列（bytes, mmap, memoryview など）
+        start: 読み終わる位置（この位置を含む）
+        end: 読み始める位置（この位置を含まない）
+        normalizer: 正規化の方法
+
+    Yields:
+        tuple: (元の文字の先頭バイト位置, 正規化した1文字)
+    """
+    ascii_table = _ASCII_NORMALIZED if normalizer in _ASCII_COMPATIBLE else None
+    pos = end
+    while pos > start:
+        last = buffer[pos - 1]
+        # ASCII 文字は手前の文字と合成されないので、それだけで1文字になる
+        if last < 0x80 and ascii_table is not None:
+            char = ascii_table[last]
+            if char:
+                yield pos - 1, char
+            pos -= 1
+            continue
+        cluster = ""
+        while pos > start:
+            head = pos - 1
+            while head > start and buffer[head] & 0xC0 == 0x80:
+                head -= 1
+            char = str(buffer[head:pos], "utf-8")
+            cluster = char + cluster
+            pos = head
+            if not _joins_previous(char):
+                break
+        # 正規化すると複数文字になる場合もあるので、後ろから返す
+        for c in reversed(_normalize_cluster(normalizer, cluster)):
+            yield pos, c
+
+
+def is_palindrome_buffer(buffer, normalizer=unicode_normalize):
+    """
+    UTF-8 のバイト列がパリンドロームかを、文字列を作らずに判定する関数
+
+    両端から1文字ずつデコードして比較し、前側の位置が後ろ側の位置を追い越したら終了する。
+    使用メモリは入力の大きさによらず一定。
+
+    Args:
+        buffer: UTF-8 のバイト列（bytes, mmap, memoryview など）
+        normalizer: 正規化の方法（文字ごとに適用する）
+
+    Returns:
+        bool: パリンドロームならTrue
+    """
+    forward = _forward_chars(buffer, 0, len(buffer), normalizer)
+    backward = _backward_chars(buffer, 0, len(buffer), normalizer)
+    for (front_pos, front), (back_pos, back) in zip(forward, backward):
+        if front_pos > back_pos:
+            break
+        if front != back:
+            return False
+    return True
+
+
+def is_palindrome_file(path, normalizer=unicode_normalize):
+    """
+    UTF-8 のテキストファイルがパリンドロームかを mmap で判定する関数
+
+    ファイルを読み込まずに mmap で開いて is_palindrome_buffer で判定するので、
+    数GBのファイルでもメモリに展開されたコピーは作らない。
+
+    Args:
+        path: ファイルのパス
+        normalizer: 正規化の方法
+
+    Returns:
+        bool: パリンドロームならTrue
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return True
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return is_palindrome_buffer(mm, normalizer)
+
+
+# ==== ローリングハッシュによる範囲の判定 ====
+# ハッシュの法（2^31 未満の2つの素数。積が uint64 に収まるので NumPy でもそのまま計算できる）
+_HASH_MODS = (2147483647, 2147483629)
+
+
+def _identity(text):
+    """正規化しない（正規化済みの文字列から PalindromeIndex を作るときに使う）"""
+    return text
+
+
+def _hash_tables(codes, mod, base):
+    """
+    文字コードの配列から、べき乗と前からの累積ハッシュを NumPy でまとめて求める
+
+    prefix[i] = (codes[0] * base^0 + ... + codes[i-1] * base^(i-1)) mod mod とする。
+    べき乗は長さを倍々にしながら作り、累積は各項を mod で割った余りの累積和で求める
+    （項は 2^31 未満なので、2^33 文字までは uint64 があふれない）。
+
+    Args:
+        codes: 文字コードの配列（np.uint64）
+        mod: ハッシュの法
+        base: ハッシュの基数
+
+    Returns:
+        tuple: (べき乗の配列, 累積ハッシュの配列)。どちらも長さ len(codes) + 1 の np.uint64
+    """
+    n = len(codes)
+    power = np.ones(1, dtype=np.uint64)
+    while len(power) < n + 1:
+        factor = np.uint64(pow(base, len(power), mod))
+        power = np.concatenate((power, power * factor % np.uint64(mod)))
+    power = power[:n + 1]
+    prefix = np.zeros(n + 1, dtype=np.uint64)
+    np.cumsum(codes * power[:n] % np.uint64(mod), out=prefix[1:])
+    prefix %= np.uint64(mod)
+    return power, prefix
+
+
+class PalindromeIndex:
+    """
+    同じ文字列に対して「text[i:j] はパリンドロームか」を何度も調べるための索引
+
+    文字列と、その反転の累積ハッシュを一度だけ求めておき、
+    各範囲の判定はスライスや反転のコピーを作らずに O(1) で行う。
+    ハッシュは2つの法で求めて array('Q') に持ち、一括判定では
+    同じバッファを NumPy の配列として読む（コピーしない）。
+    ハッシュなので異なる文字列を同じとみなす確率は 0 ではないが、
+    基数をインスタンスごとにランダムに選ぶので、およそ 1/2^62 以下になる。
+
+    位置は正規化した後の文字列での位置を表す。
+    """
+
+    def __init__(self, text, normalizer=unicode_normalize):
+        """
+        Args:
+            text: 対象の文字列
+            normalizer: 正規化の方法
+        """
+        self.text = normalizer(text)
+        n = len(self.text)
+        codes = np.frombuffer(self.text.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+        # (法, べき乗, 前からの累積, 反転した文字列の前からの累積) の組を法ごとに持つ
+        self._tables = []
+        for mod in _HASH_MODS:
+            base = random.randrange(1 << 21, mod - 1)
+            power, forward = _hash_tables(codes, mod, base)
+            _, backward = _hash_tables(codes[::-1], mod, base)
+            self._tables.append((mod, array("Q", power.tobytes()),
+                                 array("Q", forward.tobytes()), array("Q", backward.tobytes())))
+        self._n = n
+
+    def __len__(self):
+        return self._n
+
+    def mirrored(self, left, right, length):
+        """
+        text[right:right+length] が、text[left-length+1:left+1] を反転したものと一致するかを調べる
+
+        Args:
+            left: 左側の部分の末尾の位置（ここから左へ読む）
+            right: 右側の部分の先頭の位置（ここから右へ読む）
+            length: 比べる長さ
+
+        Returns:
+            bool: 一致するならTrue
+        """
+        # 右側は forward[right:right+length] / base^right、
+        # 左側の反転は backward[k:k+length] / base^k（k = n-1-left）なので、分母を払って比べる
+        k = self._n - 1 - left
+        for mod, power, forward, backward in self._tables:
+            if ((forward[right + length] - forward[right]) * power[k] % mod
+                    != (backward[k + length] - backward[k]) * power[right] % mod):
+                return False
+        return True
+
+    def is_palindrome(self, i, j):
+        """
+        text[i:j] がパリンドロームかを判定する
+
+        Args:
+            i: 開始位置
+            j: 終了位置（この位置は含まない）
+
+        Returns:
+            bool: パリンドロームならTrue
+        """
+        if not 0 <= i <= j <= self._n:
+            raise IndexError(f"範囲 [{i}, {j}) が文字列の長さ {self._n} を超えています")
+        # 前半と、反転した後半が一致すればよい
+        return self.mirrored(j - 1, i, (j - i) // 2)
+
+    def is_palindrome_many(self, starts, ends):
+        """
+        多数の範囲 text[starts[m]:ends[m]] をまとめて判定する
+
+        Args:
+            starts: 開始位置の配列
+            ends: 終了位置の配列（この位置は含まない）
+
+        Returns:
+            np.ndarray: 各範囲がパリンドロームならTrueとなる bool 配列
+        """
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        if starts.shape != ends.shape:
+            raise ValueError("starts と ends の長さが違います")
+        if starts.size and ((starts < 0) | (starts > ends) | (ends > self._n)).any():
+            raise IndexError(f"文字列の長さ {self._n} を超える範囲があります")
+        # is_palindrome と同じく、前半 text[i:i+h] と後半 text[j-h:j] の反転を比べる
+        half = (ends - starts) // 2
+        k = self._n - ends
+        result = np.ones(starts.shape, dtype=bool)
+        for mod, power, forward, backward in self._tables:
+            mod = np.uint64(mod)
+            power = np.frombuffer(power, dtype=np.uint64)
+            forward = np.frombuffer(forward, dtype=np.uint64)
+            backward = np.frombuffer(backward, dtype=np.uint64)
+            # 引き算が負にならないように mod を足してから掛ける
+            front = (forward[starts + half] + mod - forward[starts]) % mod * power[k] % mod
+            back = (backward[k + half] + mod - backward[k]) % mod * power[starts] % mod
+            result &= front == back
+        return result
+
+
+# ==== 不一致を許すパリンドローム（OCR の誤りなどへの対応） ====
+def is_palindrome_within(text, k, normalizer=unicode_normalize):
+    """
+    k 組までの不一致を許してパリンドロームを判定する関数
+    is_palindrome_two_pointer と同じく左右から比較し、不一致の数が k を超えた時点で終了する
+    """
+    # 文字列を正規化（英数字以外を削除し、大文字・小文字などをそろえる）
+    cleaned_text = normalizer(text)
+
+    mismatches = 0
+    left, right = 0, len(cleaned_text) - 1
+    while left < right:
+        if cleaned_text[left] != cleaned_text[right]:
+            mismatches += 1
+            if mismatches > k:
+                return False
+        left += 1
+        right -= 1
+
+    return True
+
+
+# _match_length() で、ハッシュを使う前に1文字ずつ直接比較する長さ
+_DIRECT_COMPARE = 8
+
+
+def _match_length(index, left, right):
+    """
+    index.text[left - t] == index.text[right + t] が t = 0, 1, ... で何回続くかを求める
+
+    最初の _DIRECT_COMPARE 文字は直接比較し（多くの中心はすぐに不一致になる）、
+    それより長く続く場合は長さを倍々にしてからハッシュの二分探索で絞り込む。
+
+    Args:
+        index: 対象の文字列の PalindromeIndex
+        left: 左へ広げる側の開始位置
+        right: 右へ広げる側の開始位置
+
+    Returns:
+        int: 一致が続く長さ
+    """
+    text = index.text
+    limit = min(left + 1, len(text) - right)
+    t = 0
+    while t < limit and t < _DIRECT_COMPARE:
+        if text[left - t] != text[right + t]:
+            return t
+        t += 1
+    if t == limit:
+        return t
+    # 一致している長さ lo と、一致しないことがわかっている長さ hi を倍々に広げて探す
+    lo, step = t, max(t, 1)
+    while True:
+        hi = min(lo + step, limit)
+        if not index.mirrored(left, right, hi):
+            break
+        if hi == limit:
+            return limit
+        lo, step = hi, 2 * step
+    hi -= 1
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if index.mirrored(left, right, mid):
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def find_palindromes_within(text, k, min_length=2, normalizer=unicode_normalize):
+    """
+    各中心について、k 組までの不一致を許した極大なパリンドロームを探すジェネレータ
+
+    中心から外側へ、一致が続く長さをハッシュの二分探索で一度に飛ばし、
+    不一致に出会うたびに予算を1つ使う。1つの中心あたりの比較は高々 k+1 回なので、
+    全体で O(n・k・log n) になる（1文字ずつ広げると最悪 O(n^2)）。
+    位置は正規化した後の文字列での位置を表す。
+
+    Args:
+        text: 対象の文字列
+        k: 許す不一致の数
+        min_length: これより短いものは返さない
+        normalizer: 正規化の方法
+
+    Yields:
+        tuple: (開始位置, 長さ)
+    """
+    cleaned_text = normalizer(text)
+    n = len(cleaned_text)
+    index = PalindromeIndex(cleaned_text, normalizer=_identity)
+    # 中心 c が偶数なら文字 c//2 が中心（奇数長）、奇数なら文字の間が中心（偶数長）
+    for c in range(2 * n - 1):
+        left, right = (c // 2 - 1, c // 2 + 1) if c % 2 == 0 else (c // 2, c // 2 + 1)
+        budget = k
+        while left >= 0 and right < n:
+            # すぐに不一致になる中心が多いので、最初の1文字は呼び出さずに比べる
+            if cleaned_text[left] == cleaned_text[right]:
+                step = _match_length(index, left, right)
+                left -= step
+                right += step
+            if left < 0 or right >= n or budget == 0:
+                break
+            # 不一致を1組許して、その先へ進む
+            budget -= 1
+            left -= 1
+            right += 1
+        length = right - left - 1
+        if length >= min_length:
+            yield left + 1, length
+
+
+def longest_palindrome_within(text, k, normalizer=unicode_normalize):
+    """
+    k 組までの不一致を許して、最長のパリンドロームである部分文字列を探す関数
+
+    Args:
+        text: 対象の文字列
+        k: 許す不一致の数
+        normalizer: 正規化の方法
+
+    Returns:
+        str: 最長の部分文字列（正規化した後の文字列）
+    """
+    cleaned_text = normalizer(text)
+    best_start, best_length = 0, min(len(cleaned_text), 1)
+    for start, length in find_palindromes_within(cleaned_text, k, normalizer=_identity):
+        if length > best_length:
+            best_start, best_length = start, length
+    return cleaned_text[best_start:best_start + best_length]
+
+
+def _longest_palindrome_within_naive(text, k, normalizer=unicode_normalize):
+    """
+    longest_palindrome_within と同じ結果を、各中心から1文字ずつ広げて求める（比較用）
+    """
+    cleaned_text = normalizer(text)
+    n = len(cleaned_text)
+    best_start, best_length = 0, min(n, 1)
+    for c in range(2 * n - 1):
+        left, right = (c // 2 - 1, c // 2 + 1) if c % 2 == 0 else (c // 2, c // 2 + 1)
+        budget = k
+        while left >= 0 and right < n:
+            if cleaned_text[left] != cleaned_text[right]:
+                if budget == 0:
+                    break
+                budget -= 1
+            left -= 1
+            right += 1
+        if right - left - 1 > best_length:
+            best_start, best_length = left + 1, right - left - 1
+    return cleaned_text[best_start:best_start + best_length]
+
+
+if __name__ == "__main__":
+    # テスト
+    test_strings = [
+        "A man, a plan, a canal, Panama",
+        "race a car",
+        "Was it a car or a cat I saw?",
+        "No 'x' in Nixon",
+        "Not a palindrome",
+        "12321",
+        "Madam, I'm Adam",
+        "じいさんてんさいじ"
+    ]
+
+    print("シンプルな方法:")
+    for s in test_strings:
+        print(f'"{s}" -> {is_palindrome_simple(s)}')
+
+    print("\nポインタを使用した方法:")
+    for s in test_strings:
+        print(f'"{s}" -> {is_palindrome_two_pointer(s)}')
+
+    print("\n再帰を使用した方法:")
+    for s in test_strings:
+        print(f'"{s}" -> {is_palindrome_recursive(s)}')
+
+    print("\n再帰を使わずにまとめて比較する方法:")
+    for s in test_strings:
+        print(f'"{s}" -> {is_palindrome_iterative(s)}')
+
+    print("\n最長のパリンドロームである部分文字列（Manacher）と異なるパリンドロームの数（回文木）:")
+    for s in test_strings:
+        print(f'"{s}" -> {Manacher(s).longest()!r}, {PalindromicTree(s).distinct_count}')
+
+    print("\nまとめて判定する方法:")
+    for s, result in zip(test_strings, classify_palindromes(test_strings)):
+        print(f'"{s}" -> {result}')
+
+    print("\nバイト列を両端からデコードする方法:")
+    for s in test_strings:
+        print(f'"{s}" -> {is_palindrome_buffer(s.encode("utf-8"))}')
+
+    print("\n同じ文に対する範囲の判定（PalindromeIndex）:")
+    index = PalindromeIndex("A man, a plan, a canal: Panama! Step on no pets.")
+    ranges = [(0, 21), (21, 33), (0, 33), (2, 19)]
+    starts, ends = zip(*ranges)
+    for (i, j), result in zip(ranges, index.is_palindrome_many(starts, ends)):
+        print(f'"{index.text[i:j]}" -> {index.is_palindrome(i, j)}, {result}')
+
+    print("\n1組までの不一致を許す方法:")
+    for s in test_strings:
+        print(f'"{s}" -> {is_palindrome_within(s, 1)}, {longest_palindrome_within(s, 1)!r}')
+
+    print("\n正規化の違い（simple_normalize / unicode_normalize）:")
+    for s in ["ｂob", "Straße ssarts", "\u00e9le\u0301"]:
+        print(f'"{s}" -> {is_palindrome_simple(s, simple_normalize)} / {is_palindrome_simple(s)}')
+
+    print("\n半角カナの濁点・ハングルの字母（文字列全体の正規化 / バイト列の判定）:")
+    for s in ["ｶﾞﾀｶ", "ｶﾞｶ", "ﾊﾟﾊ", "ｶﾞﾀｶﾞ", "ﾀｹﾔﾌﾞﾔｹﾀ", "\u1100\u1161\u11a8\u1102\u1100\u1161\u11a8"]:
+        print(f'"{s}" -> {is_palindrome_simple(s)} / {is_palindrome_buffer(s.encode("utf-8"))}')
 
 # シンプルな方法：文字列を反転して元の文字列と比較する方法です。Pythonの文字列スライシング [::-1] を使って文字列を簡単に反転できます。
 # 二重ポインタ法：文字列の両端から内側に向かって文字を比較していく方法です。左端と右端から同時に文字を比較し、不一致があればパリンドロームではないと判断します。